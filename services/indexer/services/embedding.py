@@ -1,10 +1,12 @@
 import os
 import hashlib
-import math
 import asyncio
-from typing import List
+from typing import Dict, List
 from concurrent.futures import ThreadPoolExecutor
 
+import numpy as np
+import xxhash
+
 from config import settings
 
 # Global singleton instance
@@ -28,24 +30,39 @@ class HashEmbedder(BaseEmbedder):
         self.dim = dim
 
     def embed(self, texts: List[str]) -> List[List[float]]:
-        vectors: List[List[float]] = []
-        for text in texts:
-            vec = [0.0] * self.dim
+        if not texts:
+            return []
+        # Tokens repeat heavily within a batch; hash each distinct one once
+        bucket_of: Dict[str, int] = {}
+        flat: List[int] = []
+        for row, text in enumerate(texts):
+            offset = row * self.dim
             for token in text.split():
-                h = int(hashlib.sha256(token.encode("utf-8")).hexdigest(), 16)
-                idx = h % self.dim
-                vec[idx] += 1.0
-            norm = math.sqrt(sum(v * v for v in vec)) or 1.0
-            vectors.append([v / norm for v in vec])
-        return vectors
+                bucket = bucket_of.get(token)
+                if bucket is None:
+                    h = xxhash.xxh3_64_intdigest(token.encode("utf-8"))
+                    bucket = bucket_of[token] = h % self.dim
+                flat.append(offset + bucket)
+        # Count tokens per (row, bucket) and normalize the whole batch at once
+        vecs = np.bincount(flat, minlength=len(texts) * self.dim).astype(np.float32)
+        vecs = vecs.reshape(len(texts), self.dim)
+        norms = np.linalg.norm(vecs, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        vecs /= norms
+        return vecs.tolist()
 
 
 class SentenceTransformerEmbedder(BaseEmbedder):
     def __init__(
         self, model_name: str, dim: int, batch_size: int = 32, num_workers: int = 4
     ):
+        import torch
         from sentence_transformers import SentenceTransformer
 
+        # torch starts one intra-op thread per visible core, which
+        # oversubscribes CPU-limited containers
+        torch.set_num_threads(min(8, os.cpu_count() or 1))
+
         # Set cache directory
         os.environ.setdefault("TRANSFORMERS_CACHE", "/tmp/transformers_cache")
 
@@ -176,8 +193,13 @@ class FastEmbedEmbedder(BaseEmbedder):
             print(
                 f"⚠ FastEmbed load failed, falling back to SentenceTransformers: {e} (PID: {os.getpid()})"
             )
+            import torch
             from sentence_transformers import SentenceTransformer
 
+            # torch starts one intra-op thread per visible core, which
+            # oversubscribes CPU-limited containers
+            torch.set_num_threads(min(8, os.cpu_count() or 1))
+
             self._model_name = model_name
             self._dim = dim
             cache_dir = os.environ.get(
@@ -190,16 +212,26 @@ class FastEmbedEmbedder(BaseEmbedder):
 
             self._executor = ThreadPoolExecutor(max_workers=threads)
 
-    def embed(self, texts: List[str]) -> List[List[float]]:
+    def embed(self, texts: List[str], batch_size: int = 64) -> List[List[float]]:
         if not texts:
             return []
         if self._backend == "fastembed":
-            embeddings = list(self._model.embed(texts))
-            return [e.tolist() for e in embeddings]
+            # Encode in length order so each batch pads to similar lengths;
+            # sentence-transformers already does this inside encode()
+            order = np.argsort([len(t) for t in texts], kind="stable")
+            sorted_vectors = np.stack(
+                list(
+                    self._model.embed([texts[i] for i in order], batch_size=batch_size)
+                )
+            )
+            vectors = np.empty_like(sorted_vectors)
+            vectors[order] = sorted_vectors
+            return vectors.tolist()
         else:
             vectors = self._model.encode(
                 texts,
                 normalize_embeddings=True,
+                batch_size=batch_size,
                 show_progress_bar=False,
             )
             return [v.tolist() for v in vectors]
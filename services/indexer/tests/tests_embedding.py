@@ -1,4 +1,13 @@
-from services.embedding import SentenceTransformerEmbedder
+import math
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from services.embedding import (
+    FastEmbedEmbedder,
+    HashEmbedder,
+    SentenceTransformerEmbedder,
+)
 
 
 def test_sentence_transformer_dim():
@@ -9,3 +18,26 @@ def test_sentence_transformer_dim():
     vectors = emb.embed(["hello world"])
     assert len(vectors) == 1
     assert len(vectors[0]) == 384
+
+
+def test_hash_embedder_counts_and_normalizes():
+    emb = HashEmbedder(dim=16)
+    vectors = emb.embed(["hello world hello", ""])
+    assert len(vectors) == 2
+    assert math.isclose(math.sqrt(sum(v * v for v in vectors[0])), 1.0, rel_tol=1e-6)
+    assert vectors[1] == [0.0] * 16
+    assert emb.embed(["world hello hello"]) == [vectors[0]]
+
+
+def test_fastembed_embedder_encodes_by_length_and_keeps_order():
+    emb = FastEmbedEmbedder.__new__(FastEmbedEmbedder)
+    emb._backend = "fastembed"
+    emb._model = MagicMock()
+    emb._model.embed.side_effect = lambda texts, batch_size: (
+        np.array([len(t), 0.0], dtype=np.float32) for t in texts
+    )
+
+    vectors = emb.embed(["ccc", "a", "bb"])
+
+    assert emb._model.embed.call_args.args[0] == ["a", "bb", "ccc"]
+    assert vectors == [[3.0, 0.0], [1.0, 0.0], [2.0, 0.0]]
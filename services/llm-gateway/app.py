@@ -345,33 +345,88 @@ def _get_streamer(provider: str):
     return streamers.get(provider, _ollama_stream)
 
 
+_CODE_BLOCK_RE = re.compile(r"```(?:json)?\s*([\s\S]*?)```")
+
+
+def _find_json_object_end(text: str, start: int) -> int:
+    """Return the index just past the balanced object opening at text[start], or -1."""
+    depth = 0
+    in_string = False
+    escape = False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                return i + 1
+    return -1
+
+
 def _extract_json_from_text(text: str) -> Optional[Dict[str, Any]]:
-    code_block_pattern = r"```(?:json)?\s*([\s\S]*?)```"
-    matches = re.findall(code_block_pattern, text)
+    stripped = text.strip()
 
-    for match in matches:
+    # Most responses are a bare object; skip the regex scans for them. Bare
+    # arrays go through the brace scan so an object inside them is returned.
+    if stripped[:1] == "{":
+        try:
+            return json.loads(stripped)
+        except json.JSONDecodeError:
+            pass
+
+    if "```" in text:
+        for match in _CODE_BLOCK_RE.findall(text):
+            try:
+                return json.loads(match.strip())
+            except json.JSONDecodeError:
+                continue
+
+    start = text.find("{")
+    end = text.rfind("}")
+    if start != -1 and end > start:
         try:
-            return json.loads(match.strip())
+            return json.loads(text[start : end + 1])
         except json.JSONDecodeError:
-            continue
+            pass
 
-    json_pattern = r"\{[\s\S]*\}"
-    matches = re.findall(json_pattern, text)
+        # Trailing prose with braces: fall back to the first balanced object
+        end = _find_json_object_end(text, start)
+        if end != -1:
+            try:
+                return json.loads(text[start:end])
+            except json.JSONDecodeError:
+                pass
 
-    for match in matches:
+    if stripped[:1] != "{":
         try:
-            return json.loads(match)
+            return json.loads(stripped)
         except json.JSONDecodeError:
-            continue
-
-    try:
-        return json.loads(text.strip())
-    except json.JSONDecodeError:
-        pass
+            pass
 
     return None
 
 
+# JSON schema type -> (accepted Python types, description used in errors)
+_TYPE_CHECKS = {
+    "string": (str, "a string"),
+    "integer": (int, "an integer"),
+    "number": ((int, float), "a number"),
+    "boolean": (bool, "a boolean"),
+    "array": (list, "an array"),
+    "object": (dict, "an object"),
+}
+
+
 def _validate_against_schema(data: Dict[str, Any], schema: Dict[str, Any]) -> List[str]:
     errors = []
 
@@ -390,20 +445,10 @@ def _validate_against_schema(data: Dict[str, Any], schema: Dict[str, Any]) -> Li
     for field, value in data.items():
         if field in properties:
             prop_schema = properties[field]
-            expected_type = prop_schema.get("type")
-
-            if expected_type == "string" and not isinstance(value, str):
-                errors.append(f"Field '{field}' should be a string")
-            elif expected_type == "integer" and not isinstance(value, int):
-                errors.append(f"Field '{field}' should be an integer")
-            elif expected_type == "number" and not isinstance(value, (int, float)):
-                errors.append(f"Field '{field}' should be a number")
-            elif expected_type == "boolean" and not isinstance(value, bool):
-                errors.append(f"Field '{field}' should be a boolean")
-            elif expected_type == "array" and not isinstance(value, list):
-                errors.append(f"Field '{field}' should be an array")
-            elif expected_type == "object" and not isinstance(value, dict):
-                errors.append(f"Field '{field}' should be an object")
+            check = _TYPE_CHECKS.get(prop_schema.get("type"))
+
+            if check is not None and not isinstance(value, check[0]):
+                errors.append(f"Field '{field}' should be {check[1]}")
 
             if "enum" in prop_schema and value not in prop_schema["enum"]:
                 errors.append(
@@ -426,15 +471,8 @@ def _calculate_confidence(
         error_weight = len(validation_errors) / total_fields
         return max(0.0, 1.0 - error_weight * 0.5)
 
-    required = schema.get("required", [])
-    if required:
-        filled_required = sum(1 for field in required if data.get(field) is not None)
-        completeness = filled_required / len(required)
-    else:
-        completeness = 1.0
-
-    confidence = 0.7 + (completeness * 0.3)
-    return min(1.0, confidence)
+    # No validation errors means every required field is present and non-null
+    return 1.0
 
 
 def _extract_citations(text: str) -> List[str]:
@@ -9,6 +9,8 @@ sys.path.insert(0, "/Users/thiennlinh/Documents/New project/shared")
 
 from config import settings
 from utils.qdrant_store import QdrantStore, init_qdrant, close_qdrant
+from utils.extraction import close_http_client
+from utils.enhanced_search import close_query_cache
 from routes.cache import cache_router
 from routes.chunks import router as chunks_router
 from routes.extract import extract_router
@@ -70,6 +72,19 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logging.info(f"⚠️ Model warmup failed: {e}")
 
+    # HyDE warmup: pre-generate hypothetical answers for common queries
+    if settings.hyde_warmup_queries_path:
+        logging.info("🔥 Warming up HyDE cache...")
+        try:
+            from utils.hyde import get_hyde_generator
+
+            with open(settings.hyde_warmup_queries_path, encoding="utf-8") as f:
+                queries = [line.strip() for line in f if line.strip()]
+            await get_hyde_generator().warmup(queries)
+            logging.info(f"✅ HyDE cache warmed with {len(queries)} queries")
+        except Exception as e:
+            logging.info(f"⚠️ HyDE warmup failed: {e}")
+
     logging.info("✅ Query API startup complete")
 
     yield
@@ -77,6 +92,8 @@ async def lifespan(app: FastAPI):
     # ===== Shutdown =====
     logging.info("🛑 Shutting down Query API...")
     await close_qdrant()
+    await close_http_client()
+    await close_query_cache()
     logging.info("✅ Query API shutdown complete")
     logging.info("🧹 Qdrant pool closed")
 
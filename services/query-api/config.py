@@ -10,6 +10,7 @@ class Settings(BaseSettings):
     qdrant_grpc_port: int = 6334
     qdrant_collection: str = "rag_chunks"
     embedding_dim: int = 1024
+    embedding_cache_size: int = 10000  # Query embeddings kept in memory
 
     opensearch_url: str = "http://localhost:9200"
     opensearch_index: str = "rag_chunks"
@@ -45,11 +46,17 @@ class Settings(BaseSettings):
     cache_ttl_search: int = 300
     cache_ttl_rag: int = 600
     cache_ttl_extraction: int = 1800
+    rag_semantic_cache_threshold: float = 0.0  # Cosine cutoff; 0 disables
+    rag_semantic_cache_size: int = 1024
     redis_url: str = "redis://localhost:6379/0"
 
     hyde_enabled: bool = False  # Tắt để tăng tốc, bật khi cần accuracy cao
     hyde_max_length: int = 200
     hyde_temperature: float = 0.3
+    hyde_semantic_cache_threshold: float = 0.0  # Cosine cutoff; 0 disables
+    hyde_semantic_cache_size: int = 1024
+    hyde_warmup_queries_path: str = ""  # One query per line; empty disables
+    hyde_embedding_cache_dtype: str = "float16"  # Empty caches full float32
 
     query_decomposition_enabled: bool = False  # Tắt để tăng tốc
     decomposition_max_subqueries: int = 3
@@ -58,6 +65,8 @@ class Settings(BaseSettings):
     query_cache_enabled: bool = True
     query_cache_ttl: int = 3600
     query_cache_max_size: int = 10000
+    query_cache_snapshot_path: str = ""  # Empty disables L1 snapshots
+    query_cache_snapshot_interval: int = 300
 
     model_config = SettingsConfigDict(env_prefix="RAG_")
 
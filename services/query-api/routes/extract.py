@@ -1,3 +1,5 @@
+import asyncio
+
 from schema import ExtractRequest, ExtractResult, ExtractionJobResponse
 from typing import Optional
 from fastapi import HTTPException
@@ -12,7 +14,7 @@ extract_router = APIRouter()
 
 
 @extract_router.post("/extract", response_model=ExtractResult)
-def extract_data(
+async def extract_data(
     payload: ExtractRequest, auth: TenantContext = Depends(get_tenant_context)
 ):
     """
@@ -21,7 +23,7 @@ def extract_data(
     auth.validate_tenant(payload.tenant_id)
     extraction_service = ExtractionService()
 
-    result = extraction_service.extract_from_search(
+    result = await extraction_service.extract_from_search(
         query=payload.query,
         tenant_id=payload.tenant_id,
         extraction_schema=payload.schema,
@@ -38,7 +40,7 @@ def extract_data(
 
 
 @extract_router.post("/extract/jobs", response_model=ExtractionJobResponse)
-def create_extraction_job(
+async def create_extraction_job(
     payload: ExtractRequest,
     db: Session = Depends(get_db_session),
     auth: TenantContext = Depends(get_tenant_context),
@@ -49,8 +51,10 @@ def create_extraction_job(
     auth.validate_tenant(payload.tenant_id)
     storage_service = ExtractionStorageService(db)
 
+    # The storage layer uses a blocking Session; keep it off the event loop
     # Create job
-    job = storage_service.create_job(
+    job = await asyncio.to_thread(
+        storage_service.create_job,
         tenant_id=payload.tenant_id,
         query=payload.query,
         schema_definition=payload.schema,
@@ -60,12 +64,12 @@ def create_extraction_job(
     )
 
     # Update status to processing
-    storage_service.update_job_status(job.id, "processing")
+    await asyncio.to_thread(storage_service.update_job_status, job.id, "processing")
 
     try:
         # Perform extraction
         extraction_service = ExtractionService()
-        result = extraction_service.extract_from_search(
+        result = await extraction_service.extract_from_search(
             query=payload.query,
             tenant_id=payload.tenant_id,
             extraction_schema=payload.schema,
@@ -74,7 +78,8 @@ def create_extraction_job(
         )
 
         # Save result
-        storage_service.save_result(
+        await asyncio.to_thread(
+            storage_service.save_result,
             job_id=job.id,
             data=result.data,
             confidence=result.confidence,
@@ -85,10 +90,15 @@ def create_extraction_job(
 
         # Update job status
         if result.success:
-            storage_service.update_job_status(job.id, "completed")
+            await asyncio.to_thread(
+                storage_service.update_job_status, job.id, "completed"
+            )
         else:
-            storage_service.update_job_status(
-                job.id, "failed", error_message="; ".join(result.validation_errors)
+            await asyncio.to_thread(
+                storage_service.update_job_status,
+                job.id,
+                "failed",
+                error_message="; ".join(result.validation_errors),
             )
 
         return ExtractionJobResponse(
@@ -101,7 +111,12 @@ def create_extraction_job(
         )
 
     except Exception as e:
-        storage_service.update_job_status(job.id, "failed", error_message=str(e))
+        await asyncio.to_thread(
+            storage_service.update_job_status,
+            job.id,
+            "failed",
+            error_message=str(e),
+        )
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -15,8 +15,7 @@ from schema import (
 from fastapi import APIRouter, Depends
 from config import settings
 from utils.security import get_tenant_context, TenantContext
-from utils.hyde import HyDESearchEngine, HyDEGenerator, HyDEEmbedder
-from utils.embedding import embedder_factory
+from utils.hyde import HyDESearchEngine, get_hyde_embedder, get_hyde_generator
 from utils.qdrant_store import QdrantStore
 from utils.opensearch_store import OpenSearchStore
 from utils.query_decomposition import QueryDecomposer
@@ -96,10 +95,9 @@ async def hyde_search(
 
     qdrant = QdrantStore()
     opensearch = OpenSearchStore()
-    embedder = embedder_factory()
 
-    hyde_generator = HyDEGenerator()
-    hyde_embedder = HyDEEmbedder(embedder)
+    hyde_generator = get_hyde_generator()
+    hyde_embedder = get_hyde_embedder()
 
     engine = HyDESearchEngine(
         hyde_generator=hyde_generator,
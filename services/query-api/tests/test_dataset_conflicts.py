@@ -7,27 +7,75 @@ This dataset provides realistic scenarios for testing the conflict resolver:
 - Mixed conflicts (both version and authority)
 """
 
-from dataclasses import dataclass
-from typing import Dict, List, Any
+import json
+import os
+from dataclasses import dataclass, field, replace
+from types import SimpleNamespace
+from typing import Callable, Dict, List, Any, Optional, TextIO, Tuple
 
+# Bump whenever the dataset below changes so memoized suite results are dropped
+DATASET_VERSION = 1
 
-@dataclass
+# Memoized suite results keyed by id(resolver) and DATASET_VERSION; each entry
+# holds the resolver itself so its id cannot be reused while cached
+_SUITE_RESULT_CACHE: Dict[Tuple[int, int], Tuple[Callable, Dict[str, Any]]] = {}
+_SUITE_RESULT_CACHE_SIZE = 4
+
+
+@dataclass(slots=True, frozen=True)
 class ConflictTestCase:
     """A test case for conflict resolution."""
 
     name: str
     description: str
-    chunks: List[Dict[str, Any]]
+    chunks: Tuple[Dict[str, Any], ...]
     source_priority: Dict[str, int]
     expected_winner: Dict[str, Any]
     expected_conflict_type: str
+    check: Optional[Callable[[List[Any], List[Any]], Optional[str]]] = field(
+        default=None, repr=False, compare=False
+    )
+
+
+def _check_no_conflict(resolved: List[Any], conflicts: List[Any]) -> Optional[str]:
+    """Return an error message if the resolver reported any conflicts."""
+    if len(conflicts) > 0:
+        return f"Expected no conflicts, got {len(conflicts)}"
+    return None
+
+
+def _check_authority_winner(
+    expected_source: str,
+) -> Callable[[List[Any], List[Any]], Optional[str]]:
+    """Build a checker asserting conflicts were found and expected_source won."""
+
+    def check(resolved: List[Any], conflicts: List[Any]) -> Optional[str]:
+        if len(conflicts) == 0:
+            return "Expected conflicts but none detected"
+        if not resolved:
+            return "Expected a resolved winner but none returned"
+        if resolved[0].source != expected_source:
+            return f"Expected source {expected_source}, got {resolved[0].source}"
+        return None
+
+    return check
 
 
 # Test dataset
 def get_conflict_test_dataset() -> List[ConflictTestCase]:
     """Return the complete test dataset for conflict resolution."""
+    return _build_conflict_test_dataset()
 
-    return [
+
+def _build_conflict_test_dataset() -> List[ConflictTestCase]:
+    """
+    Build the dataset and bind each case's result checker.
+
+    Chunks are frozen into tuples and gain a precomputed ``heading_key``
+    (the "/"-joined heading_path) so consumers need not rebuild it.
+    """
+
+    dataset = [
         # Test Case 1: Simple version conflict
         ConflictTestCase(
             name="version_conflict_simple",
@@ -264,6 +312,26 @@ def get_conflict_test_dataset() -> List[ConflictTestCase]:
         ),
     ]
 
+    return [
+        replace(
+            case,
+            chunks=tuple(
+                {
+                    **chunk,
+                    "heading_path": tuple(chunk["heading_path"]),
+                    "heading_key": "/".join(chunk["heading_path"]),
+                }
+                for chunk in case.chunks
+            ),
+            check=(
+                _check_no_conflict
+                if case.expected_conflict_type == "none"
+                else _check_authority_winner(case.expected_winner["source"])
+            ),
+        )
+        for case in dataset
+    ]
+
 
 def get_test_case_by_name(name: str) -> ConflictTestCase:
     """Get a specific test case by name."""
@@ -274,73 +342,100 @@ def get_test_case_by_name(name: str) -> ConflictTestCase:
     raise ValueError(f"Test case '{name}' not found")
 
 
-def run_conflict_test_suite(resolver_func) -> Dict[str, Any]:
+def run_conflict_test_suite(
+    resolver_func, out_stream: Optional[TextIO] = None
+) -> Dict[str, Any]:
     """
     Run the complete test suite against a resolver function.
 
     Args:
         resolver_func: Function that takes (chunks, source_priority) and returns
                       (resolved_chunks, conflicts)
+        out_stream: Optional text stream; when given, each case result is
+                    written to it as an NDJSON line and the returned dict
+                    only carries the passed/failed/total counters
 
     Returns:
         Dict with test results and statistics
-    """
-    import sys
-
-    sys.path.insert(0, "/Users/thiennlinh/Documents/New project")
 
+    Set CACHE_TEST_RESULTS=1 to reuse the result of a previous run against
+    the same resolver object instead of re-executing the suite. Resolvers
+    that share code but differ in closures or globals are distinct objects
+    and are run separately.
+    Streamed runs are never cached.
+    """
+    if out_stream is not None or os.getenv("CACHE_TEST_RESULTS", "0") != "1":
+        return _run_conflict_test_suite(resolver_func, out_stream)
+
+    key = (id(resolver_func), DATASET_VERSION)
+    entry = _SUITE_RESULT_CACHE.get(key)
+    if entry is not None and entry[0] is resolver_func:
+        cached = entry[1]
+    else:
+        cached = _run_conflict_test_suite(resolver_func)
+        if len(_SUITE_RESULT_CACHE) >= _SUITE_RESULT_CACHE_SIZE:
+            _SUITE_RESULT_CACHE.pop(next(iter(_SUITE_RESULT_CACHE)))
+        _SUITE_RESULT_CACHE[key] = (resolver_func, cached)
+
+    return {**cached, "details": list(cached["details"])}
+
+
+def _run_conflict_test_suite(
+    resolver_func, out_stream: Optional[TextIO] = None
+) -> Dict[str, Any]:
+    """Execute every dataset case against resolver_func."""
     results = {
         "passed": 0,
         "failed": 0,
         "total": 0,
-        "details": [],
     }
 
+    if out_stream is None:
+        details: List[Dict[str, Any]] = []
+        results["details"] = details
+        emit = details.append
+    else:
+
+        def emit(detail: Dict[str, Any]) -> None:
+            out_stream.write(json.dumps(detail) + "\n")
+
     for test_case in get_conflict_test_dataset():
         results["total"] += 1
 
-        try:
-            # Convert dict chunks to objects
-            from types import SimpleNamespace
-
-            chunk_objects = [SimpleNamespace(**chunk) for chunk in test_case.chunks]
+        # Convert dict chunks to objects
+        chunk_objects = [SimpleNamespace(**chunk) for chunk in test_case.chunks]
 
+        try:
             resolved, conflicts = resolver_func(
                 chunk_objects, test_case.source_priority, log_conflicts=False
             )
-
-            # Check results
-            if test_case.expected_conflict_type == "none":
-                if len(conflicts) > 0:
-                    raise AssertionError(f"Expected no conflicts, got {len(conflicts)}")
-            else:
-                if len(conflicts) == 0:
-                    raise AssertionError("Expected conflicts but none detected")
-
-            # Check winner
-            if test_case.expected_conflict_type != "none":
-                winner = resolved[0]
-                if winner.source != test_case.expected_winner["source"]:
-                    raise AssertionError(
-                        f"Expected source {test_case.expected_winner['source']}, "
-                        f"got {winner.source}"
-                    )
-
-            results["passed"] += 1
-            results["details"].append(
+        except Exception as e:
+            results["failed"] += 1
+            emit(
                 {
                     "name": test_case.name,
-                    "status": "PASSED",
+                    "status": "FAILED",
+                    "error": str(e),
                 }
             )
+            continue
 
-        except Exception as e:
+        error = test_case.check(resolved, conflicts)
+        if error is not None:
             results["failed"] += 1
-            results["details"].append(
+            emit(
                 {
                     "name": test_case.name,
                     "status": "FAILED",
-                    "error": str(e),
+                    "error": error,
+                }
+            )
+        else:
+            results["passed"] += 1
+            emit(
+                {
+                    "name": test_case.name,
+                    "status": "PASSED",
                 }
             )
 
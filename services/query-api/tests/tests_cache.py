@@ -0,0 +1,89 @@
+"""
+Unit Tests for the Cache Module
+
+Tests cover:
+- Semantic (paraphrase) matching in front of cache_rag
+- Tenant and argument scoping of semantic matches
+- Semantic index slot reuse
+"""
+
+import numpy as np
+import pytest
+
+import sys
+
+sys.path.insert(0, "/Users/thiennlinh/Documents/New project/services/query-api")
+
+from cache import CacheManager, SemanticCache
+
+# Unit vectors: the two ML phrasings are ~0.995 apart, cooking is orthogonal
+VECTORS = {
+    "what is machine learning": [1.0, 0.0, 0.0],
+    "explain machine learning": [0.995, 0.0998, 0.0],
+    "how do I bake bread": [0.0, 1.0, 0.0],
+}
+
+
+def embed(texts):
+    return [VECTORS[t] for t in texts]
+
+
+class TestSemanticCache:
+    """Test paraphrase matching for RAG responses."""
+
+    @pytest.fixture
+    def manager(self):
+        manager = CacheManager(semantic_cache=SemanticCache(embed, threshold=0.97))
+        manager.l2_cache.redis_client = None  # L1 only
+        manager.enabled = True
+        return manager
+
+    @pytest.fixture
+    def calls(self):
+        return []
+
+    @pytest.fixture
+    def rag(self, manager, calls):
+        @manager.cache_rag(ttl=60)
+        def rag(query: str, tenant_id: str, top_k: int = 5):
+            calls.append(query)
+            return {"answer": query}
+
+        return rag
+
+    def test_paraphrase_hit_and_unrelated_miss(self, rag, calls):
+        """Test a close paraphrase reuses the answer and an unrelated query does not."""
+        first = rag("what is machine learning", "tenant-a")
+        paraphrase = rag("explain machine learning", "tenant-a")
+        unrelated = rag("how do I bake bread", "tenant-a")
+
+        assert paraphrase == first == {"answer": "what is machine learning"}
+        assert unrelated == {"answer": "how do I bake bread"}
+        assert calls == ["what is machine learning", "how do I bake bread"]
+
+    def test_no_match_across_tenants_or_arguments(self, rag, calls):
+        """Test matches are scoped to the tenant and remaining call arguments."""
+        rag("what is machine learning", "tenant-a")
+
+        other_tenant = rag("explain machine learning", "tenant-b")
+        other_top_k = rag("explain machine learning", "tenant-a", top_k=10)
+
+        assert other_tenant == {"answer": "explain machine learning"}
+        assert other_top_k == {"answer": "explain machine learning"}
+        assert len(calls) == 3
+
+    def test_least_recently_used_slot_is_reused(self):
+        """Test a full index overwrites the entry looked up least recently."""
+        cache = SemanticCache(embed, threshold=0.97, max_size=2)
+        ml = cache.embed("what is machine learning")
+        bread = cache.embed("how do I bake bread")
+        other = np.array([0.0, 0.0, 1.0], dtype=np.float32)
+
+        cache.add(ml, 1, "ml")
+        cache.add(bread, 1, "bread")
+        assert cache.lookup(ml, 1) == "ml"  # bread is now least recently used
+        cache.add(other, 1, "other")
+
+        assert cache.lookup(ml, 1) == "ml"
+        assert cache.lookup(other, 1) == "other"
+        assert cache.lookup(bread, 1) is None
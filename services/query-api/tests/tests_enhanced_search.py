@@ -8,9 +8,11 @@ Tests cover:
 - Cache warming
 """
 
+import asyncio
 import pytest
+from collections import namedtuple
 from unittest.mock import Mock, patch, AsyncMock
-from datetime import datetime, timedelta
+import time
 
 import sys
 
@@ -22,6 +24,11 @@ from enhanced_search import (
     CacheStats,
 )
 
+# Lightweight stand-ins for DB chunk rows and Qdrant hits; Mock attribute
+# access is far slower and would skew the timing assertions below.
+_Chunk = namedtuple("_Chunk", "doc_id chunk_index text source section_path")
+_Hit = namedtuple("_Hit", "payload score")
+
 
 class TestQueryCache:
     """Test query caching functionality."""
@@ -55,8 +62,11 @@ class TestQueryCache:
         result = {"data": "test result"}
         key = cache._generate_key("query", "tenant")
 
-        cache._l1_cache[key] = result
-        cache._l1_ttl[key] = datetime.now() + timedelta(seconds=3600)
+        cache._l1[key] = (
+            result,
+            time.monotonic_ns() + 3600 * 1_000_000_000,
+            "tenant",
+        )
 
         cached = await cache.get("query", "tenant")
 
@@ -70,8 +80,11 @@ class TestQueryCache:
         result = {"data": "expired"}
         key = cache._generate_key("query", "tenant")
 
-        cache._l1_cache[key] = result
-        cache._l1_ttl[key] = datetime.now() - timedelta(seconds=1)  # Expired
+        cache._l1[key] = (
+            result,
+            time.monotonic_ns() - 1_000_000_000,  # Expired
+            "tenant",
+        )
 
         cached = await cache.get("query", "tenant")
 
@@ -86,8 +99,10 @@ class TestQueryCache:
         await cache.set("query", result, "tenant")
 
         key = cache._generate_key("query", "tenant")
-        assert key in cache._l1_cache
-        assert cache._l1_cache[key] == result
+        assert key in cache._l1
+        value, _, tenant = cache._l1[key]
+        assert value == result
+        assert tenant == "tenant"
 
     @pytest.mark.asyncio
     async def test_cache_set_lru_eviction(self, cache):
@@ -98,7 +113,20 @@ class TestQueryCache:
         await cache.set("q2", {"d": 2}, "t")
         await cache.set("q3", {"d": 3}, "t")  # Should evict q1
 
-        assert len(cache._l1_cache) == 2
+        assert len(cache._l1) == 2
+
+    @pytest.mark.asyncio
+    async def test_cache_get_refreshes_lru_order(self, cache):
+        """Test an L1 hit protects the entry from the next eviction."""
+        cache.max_size = 2
+
+        await cache.set("q1", {"d": 1}, "t")
+        await cache.set("q2", {"d": 2}, "t")
+        await cache.get("q1", "t")  # q1 becomes most recently used
+        await cache.set("q3", {"d": 3}, "t")  # Should evict q2
+
+        assert cache._generate_key("q1", "t") in cache._l1
+        assert cache._generate_key("q2", "t") not in cache._l1
 
     @pytest.mark.asyncio
     async def test_delete(self, cache):
@@ -109,7 +137,7 @@ class TestQueryCache:
         await cache.delete("query", "tenant")
 
         key = cache._generate_key("query", "tenant")
-        assert key not in cache._l1_cache
+        assert key not in cache._l1
 
     @pytest.mark.asyncio
     async def test_invalidate_tenant(self, cache):
@@ -126,6 +154,98 @@ class TestQueryCache:
         # tenant-2 entry should remain
         assert await cache.get("q3", "tenant-2") is not None
 
+    @pytest.mark.asyncio
+    async def test_invalidate_tenant_unlinks_redis_keys(self, cache):
+        """Test tenant invalidation scans only the tenant's Redis namespace."""
+        tenant_key = cache._generate_key("q1", "tenant-1")
+        cache._redis = Mock()
+        cache._redis.scan_iter.return_value = iter([tenant_key])
+
+        await cache.invalidate_tenant("tenant-1")
+
+        cache._redis.scan_iter.assert_called_once_with(
+            match="qcache:tenant-1\x00*", count=1000
+        )
+        pipe = cache._redis.pipeline.return_value
+        pipe.unlink.assert_called_once_with(tenant_key)
+        pipe.execute.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_get_or_set_computes_once(self, cache):
+        """Test concurrent misses on one key run the factory only once."""
+        calls = 0
+
+        async def factory():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0)
+            return {"d": 1}
+
+        results = await asyncio.gather(
+            cache.get_or_set("query", "tenant", factory),
+            cache.get_or_set("query", "tenant", factory),
+        )
+
+        assert calls == 1
+        assert results[0] == ({"d": 1}, False)
+        assert results[1] == ({"d": 1}, True)
+        assert not cache._key_locks
+
+    @pytest.mark.asyncio
+    async def test_set_many_uses_one_pipeline(self, cache):
+        """Test batched writes fill L1 and share one Redis pipeline."""
+        cache._redis = Mock()
+
+        await cache.set_many([("q1", "t1", {"d": 1}), ("q2", "t2", {"d": 2})])
+
+        assert await cache.get("q1", "t1") == {"d": 1}
+        assert await cache.get("q2", "t2") == {"d": 2}
+        pipe = cache._redis.pipeline.return_value
+        assert pipe.setex.call_count == 2
+        pipe.execute.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_snapshot_restore_round_trip(self, cache, tmp_path):
+        """Test an L1 snapshot restores keys, values and LRU order."""
+        path = str(tmp_path / "l1.snapshot")
+        await cache.set("q1", {"d": 1}, "t1")
+        await cache.set("q2", {"d": 2}, "t2")
+        cache._l1[cache._generate_key("q3", "t3")] = (
+            {"d": 3},
+            time.monotonic_ns() - 1,  # Expired
+            "t3",
+        )
+
+        assert cache.snapshot(path) == 2
+
+        restored = QueryCache(redis_url="redis://localhost:6379/0", ttl=3600)
+        assert restored.restore(path) == 2
+        assert list(restored._l1) == [
+            cache._generate_key("q1", "t1"),
+            cache._generate_key("q2", "t2"),
+        ]
+        assert await restored.get("q1", "t1") == {"d": 1}
+
+    @pytest.mark.asyncio
+    async def test_close_writes_final_snapshot(self, cache, tmp_path):
+        """Test close() stops periodic snapshots and persists L1 for the next start."""
+        path = str(tmp_path / "l1.snapshot")
+        with patch("enhanced_search.settings") as mock_settings, patch(
+            "enhanced_search.redis.from_url"
+        ):
+            mock_settings.query_cache_snapshot_path = path
+            mock_settings.query_cache_snapshot_interval = 3600
+            await cache.initialize()
+        task = cache._snapshot_task
+        await cache.set("q1", {"d": 1}, "t1")
+
+        await cache.close()
+
+        assert task.cancelled()
+        assert cache._snapshot_task is None
+        restored = QueryCache(redis_url="redis://localhost:6379/0", ttl=3600)
+        assert restored.restore(path) == 1
+
     @pytest.mark.asyncio
     async def test_clear_all(self, cache):
         """Test clearing all cache."""
@@ -134,7 +254,7 @@ class TestQueryCache:
 
         await cache.clear_all()
 
-        assert len(cache._l1_cache) == 0
+        assert len(cache._l1) == 0
         assert await cache.get("q1", "t1") is None
 
     def test_get_stats(self, cache):
@@ -174,6 +294,17 @@ class TestEnhancedSearchEngine:
         cache = Mock(spec=QueryCache)
         cache.get = AsyncMock(return_value=None)
         cache.set = AsyncMock()
+        cache.set_many = AsyncMock()
+
+        async def get_or_set(query, tenant_id, factory, ttl=None):
+            cached = await cache.get(query, tenant_id)
+            if cached:
+                return cached, True
+            value = await factory()
+            await cache.set(query, value, tenant_id)
+            return value, False
+
+        cache.get_or_set = AsyncMock(side_effect=get_or_set)
 
         qdrant = Mock()
         opensearch = Mock()
@@ -206,7 +337,7 @@ class TestEnhancedSearchEngine:
         cache, qdrant, opensearch, embedder = mock_components
 
         qdrant.search.return_value = [
-            Mock(payload={"doc_id": "doc1", "chunk_index": 0}, score=0.95),
+            _Hit(payload={"doc_id": "doc1", "chunk_index": 0}, score=0.95),
         ]
         opensearch.bm25_search.return_value = {"hits": {"hits": []}}
         embedder.embed.return_value = [[0.1, 0.2, 0.3]]
@@ -220,7 +351,7 @@ class TestEnhancedSearchEngine:
 
         with patch("enhanced_search.get_chunks_by_ids") as mock_get:
             mock_get.return_value = [
-                Mock(
+                _Chunk(
                     doc_id="doc1",
                     chunk_index=0,
                     text="test",
@@ -257,7 +388,7 @@ class TestEnhancedSearchEngine:
 
         with patch("enhanced_search.get_chunks_by_ids") as mock_get:
             mock_get.return_value = [
-                Mock(
+                _Chunk(
                     doc_id="doc1",
                     chunk_index=0,
                     text="test",
@@ -293,7 +424,7 @@ class TestEnhancedSearchEngine:
 
         with patch("enhanced_search.get_chunks_by_ids") as mock_get:
             mock_get.return_value = [
-                Mock(
+                _Chunk(
                     doc_id="doc1",
                     chunk_index=0,
                     text="test",
@@ -324,7 +455,7 @@ class TestEnhancedSearchEngine:
 
         qdrant.search.return_value = []
         opensearch.bm25_search.return_value = {"hits": {"hits": []}}
-        embedder.embed.return_value = [[0.1]]
+        embedder.embed.return_value = [[0.1]] * 2
 
         engine = EnhancedSearchEngine(
             qdrant_store=qdrant,
@@ -342,8 +473,12 @@ class TestEnhancedSearchEngine:
             mock_get.return_value = []
             await engine.warm_cache(queries)
 
-        # Should have searched each query
-        assert cache.set.call_count == 2
+        # Should have embedded once, searched each query and stored in one batch
+        embedder.embed.assert_called_once_with(["q1", "q2"])
+        assert qdrant.search.call_count == 2
+        cache.set_many.assert_called_once()
+        stored = cache.set_many.call_args.args[0]
+        assert [(q, t) for q, t, _ in stored] == [("q1", "t1"), ("q2", "t2")]
 
 
 class TestEnhancedSearchIntegration:
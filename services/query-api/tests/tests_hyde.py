@@ -8,7 +8,9 @@ Tests cover:
 - Caching behavior
 """
 
+import numpy as np
 import pytest
+from types import SimpleNamespace
 from unittest.mock import Mock, patch, AsyncMock
 
 import sys
@@ -20,6 +22,7 @@ from hyde import (
     HyDEEmbedder,
     HyDESearchEngine,
     HypotheticalDocument,
+    SemanticHypotheticalCache,
 )
 
 
@@ -59,11 +62,10 @@ class TestHyDEGenerator:
             hypothetical_answer="cached answer",
             embedding=[],
         )
-        generator._hyde_cache["test_hash"] = cached_doc
+        generator._hyde_cache[42] = cached_doc
 
         with patch.object(generator, "_generate_hyde_prompt", return_value="prompt"):
-            with patch("hashlib.md5") as mock_hash:
-                mock_hash.return_value.hexdigest.return_value = "test_hash"
+            with patch("hyde.hash_key", return_value=42):
                 doc = await generator.generate_hypothetical("test query")
 
         assert doc == cached_doc
@@ -77,6 +79,46 @@ class TestHyDEGenerator:
         assert isinstance(doc, HypotheticalDocument)
         assert doc.hypothetical_answer == "Answer about What is AI?"
 
+    @pytest.mark.asyncio
+    async def test_generate_hypothetical_semantic_cache_hit(self):
+        """Test paraphrased queries reuse the semantically cached document."""
+        vectors = {
+            "What is ML?": [1.0, 0.0, 0.0],
+            "Explain ML": [0.99, 0.05, 0.0],
+        }
+        semantic_cache = SemanticHypotheticalCache(
+            lambda texts: [vectors[t] for t in texts], threshold=0.92
+        )
+        generator = HyDEGenerator(
+            llm_gateway_url="http://localhost:8004", semantic_cache=semantic_cache
+        )
+        mock_response = Mock()
+        mock_response.json.return_value = {"text": "ML is machine learning."}
+        mock_response.raise_for_status = Mock()
+
+        with patch("httpx.AsyncClient.post", return_value=mock_response) as post:
+            first = await generator.generate_hypothetical("What is ML?")
+            second = await generator.generate_hypothetical("Explain ML")
+
+        assert post.call_count == 1
+        assert second is first
+
+    @pytest.mark.asyncio
+    async def test_warmup_populates_cache(self, generator):
+        """Test warmed queries are served from cache without calling the LLM."""
+        mock_response = Mock()
+        mock_response.json.return_value = {"text": "warm answer"}
+        mock_response.raise_for_status = Mock()
+
+        with patch("httpx.AsyncClient.post", return_value=mock_response):
+            await generator.warmup(["q1", "q2"])
+
+        with patch("httpx.AsyncClient.post", side_effect=Exception("LLM down")):
+            doc = await generator.generate_hypothetical("q1")
+
+        assert doc.hypothetical_answer == "warm answer"
+        assert len(generator._hyde_cache) == 2
+
     def test_generate_hyde_prompt(self, generator):
         """Test prompt generation includes query and constraints."""
         prompt = generator._generate_hyde_prompt("Test query")
@@ -115,7 +157,8 @@ class TestHyDEEmbedder:
 
         embedding = hyde_embedder.embed_hypothetical(hyp_doc)
 
-        assert embedding == [0.1, 0.2, 0.3]
+        assert embedding.dtype == np.float32
+        np.testing.assert_allclose(embedding, [0.1, 0.2, 0.3], rtol=1e-6)
         mock_embedder.embed.assert_called_once_with(["This is a test answer"])
 
     def test_embed_hypothetical_cache_hit(self, hyde_embedder):
@@ -127,19 +170,51 @@ class TestHyDEEmbedder:
         )
 
         # Pre-populate cache
-        hyde_embedder._embedding_cache["cache_key"] = [0.9, 0.8, 0.7]
+        hyde_embedder._embedding_cache[42] = [0.9, 0.8, 0.7]
 
-        with patch("hashlib.md5") as mock_hash:
-            mock_hash.return_value.hexdigest.return_value = "cache_key"
+        with patch("hyde.hash_key", return_value=42):
             embedding = hyde_embedder.embed_hypothetical(hyp_doc)
 
-        assert embedding == [0.9, 0.8, 0.7]
+        assert embedding.dtype == np.float32
+        np.testing.assert_allclose(embedding, [0.9, 0.8, 0.7], rtol=1e-6)
+
+    def test_embed_hypothetical_batch(self, hyde_embedder, mock_embedder):
+        """Test batch embedding only sends cache misses, in one call."""
+        docs = [
+            HypotheticalDocument(
+                query=f"q{i}", hypothetical_answer=f"a{i}", embedding=[]
+            )
+            for i in range(5)
+        ]
+        for i in (0, 2, 4):
+            key = hyde_embedder._cache_key(f"a{i}")
+            hyde_embedder._embedding_cache[key] = [float(i)]
+        mock_embedder.embed.return_value = [[1.0], [3.0]]
+
+        embeddings = hyde_embedder.embed_hypothetical_batch(docs)
+
+        assert [e.tolist() for e in embeddings] == [[0.0], [1.0], [2.0], [3.0], [4.0]]
+        mock_embedder.embed.assert_called_once_with(["a1", "a3"])
+
+    def test_embedding_cache_stores_compact_vectors(self, mock_embedder):
+        """Test cached vectors are stored as float16 and returned as float32."""
+        hyde_embedder = HyDEEmbedder(mock_embedder, cache_dtype="float16")
+        mock_embedder.embed.return_value = [[0.5, 0.25, 0.125]]
+
+        first = hyde_embedder.embed_query("q")
+        second = hyde_embedder.embed_query("q")
+
+        (cached,) = hyde_embedder._embedding_cache.values()
+        assert cached.dtype == np.float16
+        assert first.dtype == second.dtype == np.float32
+        assert first.tolist() == second.tolist() == [0.5, 0.25, 0.125]
+        mock_embedder.embed.assert_called_once()
 
     def test_embed_query_direct(self, hyde_embedder, mock_embedder):
         """Test direct query embedding without hypothetical."""
         embedding = hyde_embedder.embed_query("direct query")
 
-        assert embedding == [0.1, 0.2, 0.3]
+        np.testing.assert_allclose(embedding, [0.1, 0.2, 0.3], rtol=1e-6)
         mock_embedder.embed.assert_called_once_with(["direct query"])
 
     def test_clear_caches(self, hyde_embedder):
@@ -156,8 +231,8 @@ class TestHyDESearchEngine:
     def mock_stores(self):
         qdrant = Mock()
         qdrant.search.return_value = [
-            Mock(payload={"doc_id": "doc1", "chunk_index": 0}, score=0.95),
-            Mock(payload={"doc_id": "doc2", "chunk_index": 1}, score=0.90),
+            SimpleNamespace(payload={"doc_id": "doc1", "chunk_index": 0}, score=0.95),
+            SimpleNamespace(payload={"doc_id": "doc2", "chunk_index": 1}, score=0.90),
         ]
 
         opensearch = Mock()
@@ -175,7 +250,7 @@ class TestHyDESearchEngine:
     def mock_hyde_components(self):
         generator = Mock()
         generator.generate_hypothetical = AsyncMock(
-            return_value=Mock(
+            return_value=SimpleNamespace(
                 query="test",
                 hypothetical_answer="hypothetical",
                 embedding=[],
@@ -235,6 +310,23 @@ class TestHyDESearchEngine:
         assert hyp_doc is None
         generator.generate_hypothetical.assert_not_called()
 
+    @pytest.mark.asyncio
+    async def test_search_without_bm25_store(self, mock_stores, mock_hyde_components):
+        """Test search falls back to vector results when BM25 is unavailable."""
+        qdrant, _ = mock_stores
+        generator, embedder = mock_hyde_components
+
+        engine = HyDESearchEngine(
+            hyde_generator=generator,
+            hyde_embedder=embedder,
+            qdrant_store=qdrant,
+        )
+
+        results, hyp_doc = await engine.search(query="What is AI?", use_hyde=True)
+
+        assert [r["id"] for r in results] == ["doc1:0", "doc2:1"]
+        assert hyp_doc is not None
+
     def test_merge_results(self, mock_stores):
         """Test result merging from vector and BM25."""
         qdrant, opensearch = mock_stores
@@ -245,7 +337,7 @@ class TestHyDESearchEngine:
         )
 
         vector_results = [
-            Mock(payload={"doc_id": "doc1", "chunk_index": 0}, score=0.95),
+            SimpleNamespace(payload={"doc_id": "doc1", "chunk_index": 0}, score=0.95),
         ]
         bm25_results = {
             "hits": {
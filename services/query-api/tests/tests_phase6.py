@@ -9,17 +9,25 @@ Tests cover:
 - API endpoints
 """
 
+import importlib.util
+import sys
+from pathlib import Path
+
+import orjson
 import pytest
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 from typing import Dict, Any, List
 
+from extraction import ExtractionResult, ExtractionService, validate_extraction_result
+from prompt_builder import RAGPromptBuilder, ContextChunk
+
 
 # ============================================================================
 # Test Data Fixtures
 # ============================================================================
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_person_schema() -> Dict[str, Any]:
     """Sample schema for person extraction."""
     return {
@@ -35,7 +43,7 @@ def sample_person_schema() -> Dict[str, Any]:
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_company_schema() -> Dict[str, Any]:
     """Sample schema for company extraction."""
     return {
@@ -55,7 +63,7 @@ def sample_company_schema() -> Dict[str, Any]:
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_search_results() -> List[Dict[str, Any]]:
     """Sample search results for testing."""
     return [
@@ -91,8 +99,6 @@ def sample_search_results() -> List[Dict[str, Any]]:
 
 def test_rag_prompt_builder_basic():
     """Test basic RAG prompt building."""
-    from prompt_builder import RAGPromptBuilder, ContextChunk
-
     builder = RAGPromptBuilder()
 
     chunks = [
@@ -119,8 +125,6 @@ def test_rag_prompt_builder_basic():
 
 def test_rag_prompt_builder_multiple_chunks():
     """Test RAG prompt with multiple chunks."""
-    from prompt_builder import RAGPromptBuilder, ContextChunk
-
     builder = RAGPromptBuilder(max_context_length=2000)
 
     chunks = [
@@ -148,8 +152,6 @@ def test_rag_prompt_builder_multiple_chunks():
 
 def test_rag_prompt_builder_respects_max_length():
     """Test that prompt builder respects max context length."""
-    from prompt_builder import RAGPromptBuilder, ContextChunk
-
     builder = RAGPromptBuilder(max_context_length=500)
 
     # Create large chunks
@@ -186,8 +188,6 @@ def test_rag_prompt_builder_respects_max_length():
 
 def test_build_extraction_prompt():
     """Test extraction prompt building."""
-    from prompt_builder import RAGPromptBuilder, ContextChunk
-
     builder = RAGPromptBuilder()
 
     chunks = [
@@ -230,14 +230,13 @@ def test_build_extraction_prompt():
 # ============================================================================
 
 
-@patch("extraction.httpx.post")
-def test_extraction_service_extract_from_text(mock_post, sample_person_schema):
+@pytest.mark.asyncio
+@patch("httpx.AsyncClient.post", new_callable=AsyncMock)
+async def test_extraction_service_extract_from_text(mock_post, sample_person_schema):
     """Test extraction from text."""
-    from extraction import ExtractionService
-
     # Mock LLM response
     mock_response = Mock()
-    mock_response.json.return_value = {
+    response_body = {
         "data": {
             "name": "John Doe",
             "age": 32,
@@ -247,13 +246,14 @@ def test_extraction_service_extract_from_text(mock_post, sample_person_schema):
         "validation_errors": [],
         "raw_text": '{"name": "John Doe", "age": 32, "email": "john@example.com"}',
     }
+    mock_response.content = orjson.dumps(response_body)
     mock_response.raise_for_status = Mock()
     mock_post.return_value = mock_response
 
     service = ExtractionService()
 
     text = "John Doe is 32 years old. Contact him at john@example.com"
-    result = service.extract_from_text(
+    result = await service.extract_from_text(
         text=text,
         extraction_task="Extract person details",
         extraction_schema=sample_person_schema,
@@ -266,26 +266,26 @@ def test_extraction_service_extract_from_text(mock_post, sample_person_schema):
     assert result.confidence >= 0.7
 
 
-@patch("extraction.httpx.post")
-def test_extraction_service_low_confidence(mock_post, sample_person_schema):
+@pytest.mark.asyncio
+@patch("httpx.AsyncClient.post", new_callable=AsyncMock)
+async def test_extraction_service_low_confidence(mock_post, sample_person_schema):
     """Test extraction with low confidence."""
-    from extraction import ExtractionService
-
     # Mock LLM response with low confidence
     mock_response = Mock()
-    mock_response.json.return_value = {
+    response_body = {
         "data": {"name": "Unknown"},
         "confidence": 0.5,
         "validation_errors": ["Missing required field: email"],
         "raw_text": '{"name": "Unknown"}',
     }
+    mock_response.content = orjson.dumps(response_body)
     mock_response.raise_for_status = Mock()
     mock_post.return_value = mock_response
 
     service = ExtractionService()
 
     text = "Some unclear text"
-    result = service.extract_from_text(
+    result = await service.extract_from_text(
         text=text,
         extraction_task="Extract person details",
         extraction_schema=sample_person_schema,
@@ -297,14 +297,13 @@ def test_extraction_service_low_confidence(mock_post, sample_person_schema):
     assert result.confidence < 0.7
 
 
-@patch("extraction.httpx.post")
-def test_extraction_service_validation_errors(mock_post, sample_person_schema):
+@pytest.mark.asyncio
+@patch("httpx.AsyncClient.post", new_callable=AsyncMock)
+async def test_extraction_service_validation_errors(mock_post, sample_person_schema):
     """Test extraction with validation errors."""
-    from extraction import ExtractionService
-
     # Mock LLM response with validation errors
     mock_response = Mock()
-    mock_response.json.return_value = {
+    response_body = {
         "data": {"name": 123, "email": "invalid"},  # Wrong types
         "confidence": 0.8,
         "validation_errors": [
@@ -313,13 +312,14 @@ def test_extraction_service_validation_errors(mock_post, sample_person_schema):
         ],
         "raw_text": '{"name": 123, "email": "invalid"}',
     }
+    mock_response.content = orjson.dumps(response_body)
     mock_response.raise_for_status = Mock()
     mock_post.return_value = mock_response
 
     service = ExtractionService()
 
     text = "Some text"
-    result = service.extract_from_text(
+    result = await service.extract_from_text(
         text=text,
         extraction_task="Extract details",
         extraction_schema=sample_person_schema,
@@ -364,6 +364,39 @@ def test_extract_json_from_text_braces():
     assert result["name"] == "John"
 
 
+@pytest.fixture(scope="module")
+def llm_gateway_app():
+    """Load llm-gateway/app.py by path; its hyphenated directory is not a package."""
+    gateway_dir = Path(__file__).resolve().parents[2] / "llm-gateway"
+
+    def load(name: str):
+        spec = importlib.util.spec_from_file_location(
+            f"llm_gateway_{name}", gateway_dir / f"{name}.py"
+        )
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+
+    # app.py does `from config import ...`; point it at the gateway's config
+    # rather than query-api's while it loads
+    saved_config = sys.modules.get("config")
+    sys.modules["config"] = load("config")
+    try:
+        return load("app")
+    finally:
+        if saved_config is None:
+            del sys.modules["config"]
+        else:
+            sys.modules["config"] = saved_config
+
+
+def test_extract_json_from_text_bare_array(llm_gateway_app):
+    """Test a bare array reply yields the object inside it."""
+    result = llm_gateway_app._extract_json_from_text('[{"name": "John", "age": 30}]')
+
+    assert result == {"name": "John", "age": 30}
+
+
 def test_extract_json_from_text_invalid():
     """Test JSON extraction with invalid text."""
     from services.llm_gateway.app import _extract_json_from_text
@@ -491,8 +524,6 @@ def test_calculate_confidence_with_errors():
 
 def test_validate_extraction_result_success():
     """Test validation of successful extraction."""
-    from extraction import ExtractionResult, validate_extraction_result
-
     result = ExtractionResult(
         success=True,
         data={"name": "John", "email": "john@example.com"},
@@ -513,8 +544,6 @@ def test_validate_extraction_result_success():
 
 def test_validate_extraction_result_low_confidence():
     """Test validation with low confidence."""
-    from extraction import ExtractionResult, validate_extraction_result
-
     result = ExtractionResult(
         success=True,
         data={"name": "John"},
@@ -533,8 +562,6 @@ def test_validate_extraction_result_low_confidence():
 
 def test_validate_extraction_result_missing_fields():
     """Test validation with missing required fields."""
-    from extraction import ExtractionResult, validate_extraction_result
-
     result = ExtractionResult(
         success=True,
         data={"name": "John"},  # Missing email
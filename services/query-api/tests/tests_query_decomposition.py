@@ -86,11 +86,9 @@ class TestQueryDecomposer:
             sub_queries=[SubQuery(0, "sub", "intent", ["kw"], True)],
             strategy=DecompositionStrategy.SINGLE,
         )
-        decomposer._decomposition_cache["cached_hash"] = cached_result
+        decomposer._decomposition_cache["cached query"] = cached_result
 
-        with patch("hashlib.md5") as mock_hash:
-            mock_hash.return_value.hexdigest.return_value = "cached_hash"
-            result = await decomposer.decompose("cached query")
+        result = await decomposer.decompose("  Cached Query ")
 
         assert result == cached_result
 
@@ -127,6 +125,22 @@ class TestQueryDecomposer:
         decomposer.clear_cache()
         assert len(decomposer._decomposition_cache) == 0
 
+    @pytest.mark.asyncio
+    async def test_cache_evicts_least_recently_used(self):
+        """Test the decomposition cache stays within max_cache_size."""
+        decomposer = QueryDecomposer(
+            llm_gateway_url="http://test:8004", max_subqueries=3, max_cache_size=2
+        )
+
+        with patch("httpx.AsyncClient.post", side_effect=Exception("LLM Error")):
+            first = await decomposer.decompose("first query")
+            await decomposer.decompose("second query")
+            assert await decomposer.decompose("first query") is first
+            await decomposer.decompose("third query")
+
+        assert len(decomposer._decomposition_cache) == 2
+        assert await decomposer.decompose("first query") is first
+
 
 class TestMultiQuerySearchEngine:
     """Test multi-query search functionality."""
@@ -176,6 +190,30 @@ class TestMultiQuerySearchEngine:
         assert len(decomposed.sub_queries) == 2
         assert mock_search_engine.search.call_count == 2  # Once per sub-query
 
+    @pytest.mark.asyncio
+    async def test_search_deduplicates_sub_queries(self, mock_search_engine):
+        """Test identical sub-queries share a single backend search."""
+        decomposer = Mock()
+        decomposer.decompose = AsyncMock(
+            return_value=DecomposedQuery(
+                original_query="test",
+                sub_queries=[
+                    SubQuery(0, "What is ML?", "definition", ["ML"], True),
+                    SubQuery(1, "what is  ml?", "definition", ["ML"], False),
+                ],
+                strategy=DecompositionStrategy.PARALLEL,
+            )
+        )
+        engine = MultiQuerySearchEngine(
+            decomposer=decomposer,
+            search_engine=mock_search_engine,
+        )
+
+        results, _ = await engine.search(query="test", use_decomposition=True)
+
+        assert mock_search_engine.search.call_count == 1
+        assert all(r["sub_query_matches"] == [0, 1] for r in results)
+
     @pytest.mark.asyncio
     async def test_search_without_decomposition(
         self, mock_decomposer, mock_search_engine
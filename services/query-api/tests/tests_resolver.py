@@ -9,12 +9,20 @@ These tests verify:
 - Citation generation
 """
 
+import orjson
 import pytest
 from dataclasses import dataclass
 from typing import List, Optional
 
+from resolver import (
+    detect_conflicts,
+    get_citation,
+    get_citation_bytes,
+    resolve_conflicts,
+)
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class MockChunk:
     """Mock chunk for testing."""
 
@@ -30,8 +38,6 @@ class MockChunk:
 
 def test_detect_no_conflicts():
     """Test detection when no conflicts exist."""
-    from resolver import detect_conflicts
-
     chunks = [
         MockChunk("doc1", "src_1", "api", 1, 0, "text 1"),
         MockChunk("doc2", "src_2", "manual", 1, 0, "text 2"),
@@ -43,8 +49,6 @@ def test_detect_no_conflicts():
 
 def test_detect_version_conflict():
     """Test detection of version conflicts."""
-    from resolver import detect_conflicts
-
     chunks = [
         MockChunk("doc1", "src_1", "api", 1, 0, "old text"),
         MockChunk("doc1", "src_1", "api", 2, 0, "new text"),
@@ -60,8 +64,6 @@ def test_detect_version_conflict():
 
 def test_detect_authority_conflict():
     """Test detection of authority conflicts (same version, different sources)."""
-    from resolver import detect_conflicts
-
     chunks = [
         MockChunk("doc1", "src_1", "api", 1, 0, "api text"),
         MockChunk("doc1", "src_1", "manual", 1, 0, "manual text"),
@@ -74,8 +76,6 @@ def test_detect_authority_conflict():
 
 def test_resolve_authority_priority():
     """Test resolution by source authority priority."""
-    from resolver import resolve_conflicts
-
     chunks = [
         MockChunk("doc1", "src_1", "api", 1, 0, "api text"),
         MockChunk("doc1", "src_1", "manual", 1, 0, "manual text"),
@@ -92,8 +92,6 @@ def test_resolve_authority_priority():
 
 def test_resolve_latest_version():
     """Test resolution by latest version when priority is equal."""
-    from resolver import resolve_conflicts
-
     chunks = [
         MockChunk("doc1", "src_1", "api", 1, 0, "old text"),
         MockChunk("doc1", "src_1", "api", 3, 0, "newest text"),
@@ -109,8 +107,6 @@ def test_resolve_latest_version():
 
 def test_resolve_authority_over_version():
     """Test that authority takes precedence over version."""
-    from resolver import resolve_conflicts
-
     chunks = [
         MockChunk("doc1", "src_1", "api", 5, 0, "api v5"),
         MockChunk("doc1", "src_1", "manual", 1, 0, "manual v1"),
@@ -126,8 +122,6 @@ def test_resolve_authority_over_version():
 
 def test_resolve_multiple_groups():
     """Test resolution with multiple conflict groups."""
-    from resolver import resolve_conflicts
-
     chunks = [
         MockChunk("doc1", "src_1", "api", 1, 0, "text 1a"),
         MockChunk("doc1", "src_1", "api", 2, 0, "text 1b"),
@@ -144,8 +138,6 @@ def test_resolve_multiple_groups():
 
 def test_resolve_no_conflicts():
     """Test resolution when no conflicts exist."""
-    from resolver import resolve_conflicts
-
     chunks = [
         MockChunk("doc1", "src_1", "api", 1, 0, "text 1"),
         MockChunk("doc2", "src_2", "manual", 1, 0, "text 2"),
@@ -160,8 +152,6 @@ def test_resolve_no_conflicts():
 
 def test_resolve_empty_list():
     """Test resolution with empty chunk list."""
-    from resolver import resolve_conflicts
-
     resolved, conflicts = resolve_conflicts([], {})
 
     assert len(resolved) == 0
@@ -170,8 +160,6 @@ def test_resolve_empty_list():
 
 def test_resolve_unknown_source_priority():
     """Test resolution when source priority is unknown."""
-    from resolver import resolve_conflicts
-
     chunks = [
         MockChunk("doc1", "src_1", "unknown", 1, 0, "text"),
         MockChunk("doc1", "src_1", "api", 2, 0, "api text"),
@@ -186,8 +174,6 @@ def test_resolve_unknown_source_priority():
 
 def test_get_citation_basic():
     """Test citation generation."""
-    from resolver import get_citation
-
     chunk = MockChunk(
         doc_id="doc1",
         source_id="src_1",
@@ -212,8 +198,6 @@ def test_get_citation_basic():
 
 def test_get_citation_no_heading():
     """Test citation generation without heading."""
-    from resolver import get_citation
-
     chunk = MockChunk(
         doc_id="doc1",
         source_id="src_1",
@@ -231,10 +215,28 @@ def test_get_citation_no_heading():
     assert citation["doc_id"] == "doc1"
 
 
+def test_get_citation_bytes_matches_dict():
+    """Test serialized citation matches the dict form."""
+    chunk = MockChunk(
+        doc_id="doc1",
+        source_id="src_1",
+        source="api",
+        version=3,
+        chunk_index=2,
+        text="text",
+        section_path="section",
+        heading_path=["Header"],
+    )
+
+    payload = get_citation_bytes(chunk)
+
+    assert isinstance(payload, bytes)
+    assert orjson.loads(payload) == get_citation(chunk)
+
+
 def test_conflict_logging(caplog):
     """Test that conflicts are logged properly."""
     import logging
-    from resolver import resolve_conflicts
 
     chunks = [
         MockChunk("doc1", "src_1", "api", 1, 0, "old"),
@@ -252,7 +254,6 @@ def test_conflict_logging(caplog):
 def test_conflict_logging_disabled(caplog):
     """Test that conflicts are not logged when disabled."""
     import logging
-    from resolver import resolve_conflicts
 
     chunks = [
         MockChunk("doc1", "src_1", "api", 1, 0, "old"),
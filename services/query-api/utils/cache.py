@@ -4,7 +4,7 @@ Redis Caching Strategy Module for RAG System
 This module provides intelligent caching for RAG operations.
 Features:
 - Multi-level caching (L1: in-memory, L2: Redis)
-- Semantic caching for search queries
+- Semantic caching for RAG answers (paraphrase matching, opt-in)
 - Cache invalidation strategies
 - Compression for large objects
 - TTL management
@@ -23,14 +23,15 @@ Usage:
         return perform_rag(query, tenant_id)
 """
 
-import json
+import asyncio
+import orjson
 import inspect
 import pickle
-import hashlib
 import zlib
-from typing import Any, Optional, Callable, Dict, List
+from typing import Any, Optional, Callable, Dict, List, Tuple
 from functools import wraps
 from datetime import datetime
+import numpy as np
 import redis
 from dataclasses import dataclass
 import time
@@ -38,16 +39,27 @@ import threading
 import os
 from collections import OrderedDict
 from config import settings
+from utils.hashing import hash_key
 
 # Configuration
 REDIS_URL = settings.redis_url
+REDIS_POOL_SIZE = int(os.getenv("REDIS_POOL_SIZE", "64"))
 CACHE_ENABLED = settings.cache_enabled
 CACHE_COMPRESSION = os.getenv("CACHE_COMPRESSION", "true").lower() == "true"
 CACHE_COMPRESSION_THRESHOLD = int(
     os.getenv("CACHE_COMPRESSION_THRESHOLD", "1024")
 )  # bytes
+# zlib level 1 is ~2x faster than the default 6 for ~2% larger payloads
+CACHE_COMPRESSION_LEVEL = int(os.getenv("CACHE_COMPRESSION_LEVEL", "1"))
+# Embeddings are cached at reduced precision; empty keeps them as given
+VECTOR_CACHE_DTYPE = os.getenv("VECTOR_CACHE_DTYPE", "float16")
+# Redis values start with a format version byte followed by a codec byte
+FORMAT_VERSION = b"\x01"
+FORMAT_PICKLE = FORMAT_VERSION + b"\x00"
+FORMAT_PICKLE_ZLIB = FORMAT_VERSION + b"\x01"
 L1_CACHE_SIZE = int(os.getenv("L1_CACHE_SIZE", "1000"))  # max items
 L1_CACHE_TTL = int(os.getenv("L1_CACHE_TTL", "60"))  # seconds
+L1_MAX_BYTES = int(os.getenv("L1_MAX_BYTES", "16384"))  # larger values skip L1
 
 
 @dataclass
@@ -64,61 +76,85 @@ class CacheEntry:
 
 
 class LRUCache:
-    """Thread-safe in-memory LRU cache (L1)."""
+    """Thread-safe in-memory LRU cache (L1).
+
+    Keys are spread over independently locked shards so concurrent lookups
+    of different keys rarely wait on each other. Each shard evicts its own
+    least recently used entry, which approximates global LRU order.
+    """
+
+    SHARDS = 16
 
     def __init__(self, maxsize: int = L1_CACHE_SIZE):
         self.maxsize = maxsize
-        self.cache: OrderedDict[str, Any] = OrderedDict()
-        self.lock = threading.RLock()
-        self.hits = 0
-        self.misses = 0
+        self._shard_maxsize = max(1, -(-maxsize // self.SHARDS))
+        self._shards: List[OrderedDict] = [OrderedDict() for _ in range(self.SHARDS)]
+        self._locks = [threading.Lock() for _ in range(self.SHARDS)]
+        # Per-shard counters, updated under that shard's lock
+        self._hits = [0] * self.SHARDS
+        self._misses = [0] * self.SHARDS
+
+    def _shard(self, key: str) -> int:
+        return hash(key) & (self.SHARDS - 1)
+
+    @property
+    def hits(self) -> int:
+        return sum(self._hits)
+
+    @property
+    def misses(self) -> int:
+        return sum(self._misses)
 
     def get(self, key: str) -> Optional[Any]:
         """Get item from cache."""
-        with self.lock:
-            if key in self.cache:
+        s = self._shard(key)
+        shard = self._shards[s]
+        with self._locks[s]:
+            if key in shard:
                 # Move to end (most recently used)
-                value = self.cache.pop(key)
-                self.cache[key] = value
-                self.hits += 1
-                return value
-            self.misses += 1
+                shard.move_to_end(key)
+                self._hits[s] += 1
+                return shard[key]
+            self._misses[s] += 1
             return None
 
     def set(self, key: str, value: Any):
         """Set item in cache."""
-        with self.lock:
-            if key in self.cache:
-                self.cache.pop(key)
-            elif len(self.cache) >= self.maxsize:
+        s = self._shard(key)
+        shard = self._shards[s]
+        with self._locks[s]:
+            if key in shard:
+                shard.move_to_end(key)
+            elif len(shard) >= self._shard_maxsize:
                 # Remove least recently used
-                self.cache.popitem(last=False)
+                shard.popitem(last=False)
 
-            self.cache[key] = value
+            shard[key] = value
 
     def delete(self, key: str):
         """Delete item from cache."""
-        with self.lock:
-            if key in self.cache:
-                del self.cache[key]
+        s = self._shard(key)
+        with self._locks[s]:
+            self._shards[s].pop(key, None)
 
     def clear(self):
         """Clear all items."""
-        with self.lock:
-            self.cache.clear()
+        for lock, shard in zip(self._locks, self._shards):
+            with lock:
+                shard.clear()
 
     def get_stats(self) -> Dict[str, int]:
         """Get cache statistics."""
-        with self.lock:
-            total = self.hits + self.misses
-            hit_rate = self.hits / total if total > 0 else 0
-            return {
-                "size": len(self.cache),
-                "maxsize": self.maxsize,
-                "hits": self.hits,
-                "misses": self.misses,
-                "hit_rate": round(hit_rate, 4),
-            }
+        hits, misses = self.hits, self.misses
+        total = hits + misses
+        hit_rate = hits / total if total > 0 else 0
+        return {
+            "size": sum(len(shard) for shard in self._shards),
+            "maxsize": self.maxsize,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hit_rate, 4),
+        }
 
 
 class RedisCache:
@@ -132,33 +168,40 @@ class RedisCache:
     def _connect(self):
         """Connect to Redis."""
         try:
-            self.redis_client = redis.from_url(
+            # Bounded pool shared across threads; redis-py uses hiredis if installed
+            pool = redis.BlockingConnectionPool.from_url(
                 self.redis_url,
+                max_connections=REDIS_POOL_SIZE,
                 decode_responses=False,  # We handle encoding ourselves
                 socket_connect_timeout=5,
                 socket_timeout=5,
                 health_check_interval=30,
             )
+            self.redis_client = redis.Redis(connection_pool=pool)
             self.redis_client.ping()
             print(f"✓ Connected to Redis: {self.redis_url}")
         except Exception as e:
             print(f"⚠ Redis connection failed: {e}")
             self.redis_client = None
 
-    def _compress(self, data: bytes) -> bytes:
-        """Compress data if enabled."""
+    def _encode(self, value: Any) -> bytes:
+        """Serialize a value behind a format header, compressing it if large."""
+        data = pickle.dumps(value)
         if CACHE_COMPRESSION and len(data) > CACHE_COMPRESSION_THRESHOLD:
-            return zlib.compress(data)
-        return data
-
-    def _decompress(self, data: bytes, compressed: bool = False) -> bytes:
-        """Decompress data."""
-        if compressed or (CACHE_COMPRESSION and data.startswith(b"x\\x9c")):
-            try:
-                return zlib.decompress(data)
-            except:
-                pass
-        return data
+            return FORMAT_PICKLE_ZLIB + zlib.compress(data, CACHE_COMPRESSION_LEVEL)
+        return FORMAT_PICKLE + data
+
+    def _decode(self, data: bytes) -> Any:
+        """Reverse _encode, dispatching on the format header."""
+        header = data[:2]
+        if header == FORMAT_PICKLE:
+            return pickle.loads(data[2:])
+        if header == FORMAT_PICKLE_ZLIB:
+            return pickle.loads(zlib.decompress(data[2:]))
+        # Entries written before the format header was introduced
+        if data.startswith(b"CMP:"):
+            return pickle.loads(zlib.decompress(data[4:]))
+        return pickle.loads(data)
 
     def get(self, key: str) -> Optional[Any]:
         """Get item from Redis."""
@@ -168,45 +211,65 @@ class RedisCache:
         try:
             data = self.redis_client.get(key)
             if data:
-                # Check if compressed
-                compressed = data.startswith(b"CMP:")
-                if compressed:
-                    data = data[4:]  # Remove prefix
-                    data = zlib.decompress(data)
-
-                return pickle.loads(data)
+                return self._decode(data)
         except Exception as e:
             print(f"Redis get error: {e}")
 
         return None
 
+    def mget(self, keys: List[str]) -> List[Optional[Any]]:
+        """Get several items from Redis in one round trip."""
+        if not self.redis_client or not keys:
+            return [None] * len(keys)
+
+        try:
+            return [
+                self._decode(data) if data else None
+                for data in self.redis_client.mget(keys)
+            ]
+        except Exception as e:
+            print(f"Redis mget error: {e}")
+            return [None] * len(keys)
+
     def set(self, key: str, value: Any, ttl: int = 300, tags: List[str] = None):
         """Set item in Redis."""
         if not self.redis_client:
             return False
 
         try:
-            # Serialize
-            data = pickle.dumps(value)
-
-            # Compress if large
-            compressed = False
-            if CACHE_COMPRESSION and len(data) > CACHE_COMPRESSION_THRESHOLD:
-                data = b"CMP:" + zlib.compress(data)
-                compressed = True
+            # Value and tag index go out in a single round trip
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.setex(key, ttl, self._encode(value))
+            if tags:
+                for tag in tags:
+                    pipe.sadd(f"tag:{tag}", key)
+                    pipe.expire(f"tag:{tag}", ttl)
+            pipe.execute()
+            return True
+        except Exception as e:
+            print(f"Redis set error: {e}")
+            return False
 
-            # Store
-            self.redis_client.setex(key, ttl, data)
+    def set_many(
+        self, items: List[Tuple[str, Any]], ttl: int = 300, tags: List[str] = None
+    ):
+        """Set several items in Redis in one pipelined round trip."""
+        if not self.redis_client or not items:
+            return False
 
-            # Add to tag index
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for key, value in items:
+                pipe.setex(key, ttl, self._encode(value))
             if tags:
+                keys = [key for key, _ in items]
                 for tag in tags:
-                    self.redis_client.sadd(f"tag:{tag}", key)
-                    self.redis_client.expire(f"tag:{tag}", ttl)
-
+                    pipe.sadd(f"tag:{tag}", *keys)
+                    pipe.expire(f"tag:{tag}", ttl)
+            pipe.execute()
             return True
         except Exception as e:
-            print(f"Redis set error: {e}")
+            print(f"Redis set_many error: {e}")
             return False
 
     def delete(self, key: str):
@@ -253,19 +316,109 @@ class RedisCache:
             return -2
 
 
+class SemanticCache:
+    """
+    Nearest-neighbour index from query meaning to exact cache keys.
+
+    Paraphrased questions miss the exact-key cache even though an earlier
+    answer would serve them. Normalized query vectors are kept in a
+    fixed-size matrix alongside the cache key of the answer they produced,
+    so a lookup is one inner-product scan. Each entry carries a scope (tenant
+    plus the remaining call arguments) and only matches within it; the least
+    recently used slot is reused when full. Answers themselves stay in L1/L2,
+    so TTLs and tag invalidation still apply.
+    """
+
+    def __init__(
+        self,
+        embed_fn: Callable[[List[str]], Any],
+        threshold: float = 0.97,
+        max_size: int = 1024,
+    ):
+        self.embed_fn = embed_fn
+        self.threshold = threshold
+        self.max_size = max_size
+        self._vectors: Optional[np.ndarray] = None
+        self._scopes = np.zeros(max_size, dtype=np.int64)
+        self._keys: List[Optional[str]] = [None] * max_size
+        self._last_used = np.zeros(max_size, dtype=np.int64)
+        self._size = 0
+        self._tick = 0
+        self._lock = threading.Lock()
+
+    def embed(self, query: str) -> np.ndarray:
+        """Embed and L2-normalize a query."""
+        vector = np.asarray(self.embed_fn([query])[0], dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    def lookup(self, vector: np.ndarray, scope: int) -> Optional[str]:
+        """Return the cache key of the most similar query in scope."""
+        with self._lock:
+            if self._size == 0:
+                return None
+            scores = self._vectors[: self._size] @ vector
+            scores[self._scopes[: self._size] != scope] = -np.inf
+            best = int(np.argmax(scores))
+            if scores[best] < self.threshold:
+                return None
+            self._tick += 1
+            self._last_used[best] = self._tick
+            return self._keys[best]
+
+    def add(self, vector: np.ndarray, scope: int, key: str):
+        """Remember that a query vector's answer is cached under key."""
+        with self._lock:
+            if self._vectors is None:
+                self._vectors = np.zeros(
+                    (self.max_size, vector.shape[0]), dtype=np.float32
+                )
+            if self._size < self.max_size:
+                slot = self._size
+                self._size += 1
+            else:
+                slot = int(np.argmin(self._last_used))
+            self._tick += 1
+            self._vectors[slot] = vector
+            self._scopes[slot] = scope
+            self._keys[slot] = key
+            self._last_used[slot] = self._tick
+
+    def clear(self):
+        """Drop all entries."""
+        with self._lock:
+            self._keys = [None] * self.max_size
+            self._last_used[:] = 0
+            self._size = 0
+
+
 class CacheManager:
     """Multi-level cache manager."""
 
-    def __init__(self):
+    def __init__(self, semantic_cache: Optional[SemanticCache] = None):
         self.l1_cache = LRUCache(maxsize=L1_CACHE_SIZE)
         self.l2_cache = RedisCache()
         self.enabled = CACHE_ENABLED
+        # Optional paraphrase matching in front of cache_rag misses
+        self.semantic_cache = semantic_cache
 
     def _generate_key(self, prefix: str, *args, **kwargs) -> str:
         """Generate cache key from arguments."""
         key_data = {"prefix": prefix, "args": args, "kwargs": kwargs}
-        key_str = json.dumps(key_data, sort_keys=True)
-        return f"{prefix}:{hashlib.md5(key_str.encode()).hexdigest()}"
+        key_bytes = orjson.dumps(
+            key_data, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+        )
+        return f"{prefix}:{hash_key(key_bytes):032x}"
+
+    def _l1_set(self, key: str, value: Any):
+        """Store a value in L1 as pickled bytes, skipping oversized ones.
+
+        Bytes are far more compact than live object graphs (a list of floats
+        costs ~32 bytes per element), and callers can't mutate cached state.
+        """
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(blob) <= L1_MAX_BYTES:
+            self.l1_cache.set(key, blob)
 
     def get(self, key: str, use_l1: bool = True, use_l2: bool = True) -> Optional[Any]:
         """Get from cache (L1 -> L2)."""
@@ -274,9 +427,9 @@ class CacheManager:
 
         # Try L1
         if use_l1:
-            value = self.l1_cache.get(key)
-            if value is not None:
-                return value
+            blob = self.l1_cache.get(key)
+            if blob is not None:
+                return pickle.loads(blob)
 
         # Try L2
         if use_l2:
@@ -284,7 +437,7 @@ class CacheManager:
             if value is not None:
                 # Promote to L1
                 if use_l1:
-                    self.l1_cache.set(key, value)
+                    self._l1_set(key, value)
                 return value
 
         return None
@@ -304,7 +457,7 @@ class CacheManager:
 
         # L1 cache (short TTL)
         if use_l1:
-            self.l1_cache.set(key, value)
+            self._l1_set(key, value)
 
         # L2 cache (Redis)
         if use_l2:
@@ -322,8 +475,16 @@ class CacheManager:
     def clear_all(self):
         """Clear all caches."""
         self.l1_cache.clear()
+        if self.semantic_cache is not None:
+            self.semantic_cache.clear()
         # Note: Don't clear Redis entirely, use tags for selective clearing
 
+    def _semantic_get(self, query: str, scope: int) -> Tuple[np.ndarray, Optional[Any]]:
+        """Embed a query and return a cached answer for a close paraphrase."""
+        vector = self.semantic_cache.embed(query)
+        key = self.semantic_cache.lookup(vector, scope)
+        return vector, self.get(key) if key is not None else None
+
     # Decorators for common use cases
     def cache_search(self, ttl: int = 300):
         """Decorator for caching search results."""
@@ -388,8 +549,20 @@ class CacheManager:
                     if cached is not None:
                         return cached
 
+                    if self.semantic_cache is not None:
+                        scope = hash(
+                            self._generate_key("rag", tenant_id, *args, **kwargs)
+                        )
+                        vector, cached = await asyncio.to_thread(
+                            self._semantic_get, query, scope
+                        )
+                        if cached is not None:
+                            return cached
+
                     result = await func(query, tenant_id, *args, **kwargs)
                     self.set(cache_key, result, ttl, tags=["rag", tenant_id])
+                    if self.semantic_cache is not None:
+                        self.semantic_cache.add(vector, scope, cache_key)
                     return result
 
                 return wrapper
@@ -407,8 +580,18 @@ class CacheManager:
                     if cached is not None:
                         return cached
 
+                    if self.semantic_cache is not None:
+                        scope = hash(
+                            self._generate_key("rag", tenant_id, *args, **kwargs)
+                        )
+                        vector, cached = self._semantic_get(query, scope)
+                        if cached is not None:
+                            return cached
+
                     result = func(query, tenant_id, *args, **kwargs)
                     self.set(cache_key, result, ttl, tags=["rag", tenant_id])
+                    if self.semantic_cache is not None:
+                        self.semantic_cache.add(vector, scope, cache_key)
                     return result
 
                 return wrapper
@@ -425,9 +608,8 @@ class CacheManager:
                     return func(query, schema, tenant_id, *args, **kwargs)
 
                 # Include schema hash in key
-                schema_hash = hashlib.md5(
-                    json.dumps(schema, sort_keys=True).encode()
-                ).hexdigest()[:8]
+                schema_key = hash_key(orjson.dumps(schema, option=orjson.OPT_SORT_KEYS))
+                schema_hash = f"{schema_key:032x}"[:8]
                 cache_key = self._generate_key(
                     "extract", query, schema_hash, tenant_id, *args, **kwargs
                 )
@@ -456,40 +638,36 @@ class CacheManager:
                 if not self.enabled:
                     return func(texts, *args, **kwargs)
 
-                # Individual text embeddings
-                results = []
-                missing_texts = []
-                missing_indices = []
-
-                for i, text in enumerate(texts):
-                    cache_key = self._generate_key("vector", text, *args, **kwargs)
-                    cached = self.get(
-                        cache_key, use_l1=False
-                    )  # Vectors too large for L1
-
-                    if cached is not None:
-                        results.append((i, cached))
-                    else:
-                        missing_texts.append(text)
-                        missing_indices.append(i)
-
-                if missing_texts:
+                # Vectors are too large for L1; fetch them all from L2 at once
+                keys = [
+                    self._generate_key("vector", text, *args, **kwargs)
+                    for text in texts
+                ]
+                # Hits and misses are both returned as float32 arrays
+                results = [
+                    None if cached is None else np.asarray(cached, dtype=np.float32)
+                    for cached in self.l2_cache.mget(keys)
+                ]
+                missing_indices = [i for i, r in enumerate(results) if r is None]
+
+                if missing_indices:
                     # Batch embed missing texts
-                    embeddings = func(missing_texts, *args, **kwargs)
+                    embeddings = func(
+                        [texts[i] for i in missing_indices], *args, **kwargs
+                    )
 
                     # Cache and add to results
-                    for idx, text, embedding in zip(
-                        missing_indices, missing_texts, embeddings
-                    ):
-                        cache_key = self._generate_key("vector", text, *args, **kwargs)
-                        self.set(
-                            cache_key, embedding, ttl, tags=["vector"], use_l1=False
-                        )
-                        results.append((idx, embedding))
-
-                # Sort by original index
-                results.sort(key=lambda x: x[0])
-                return [r[1] for r in results]
+                    items = []
+                    for idx, embedding in zip(missing_indices, embeddings):
+                        embedding = np.asarray(embedding, dtype=np.float32)
+                        results[idx] = embedding
+                        stored = embedding
+                        if VECTOR_CACHE_DTYPE:
+                            stored = np.asarray(embedding, dtype=VECTOR_CACHE_DTYPE)
+                        items.append((keys[idx], stored))
+                    self.l2_cache.set_many(items, ttl, tags=["vector"])
+
+                return results
 
             return wrapper
 
@@ -505,8 +683,24 @@ class CacheManager:
         }
 
 
+def _embed_queries(texts: List[str]):
+    from utils.embedding import embedder_factory
+
+    return [embedder_factory().embed_query(text) for text in texts]
+
+
 # Global instance
-cache_manager = CacheManager()
+cache_manager = CacheManager(
+    semantic_cache=(
+        SemanticCache(
+            _embed_queries,
+            threshold=settings.rag_semantic_cache_threshold,
+            max_size=settings.rag_semantic_cache_size,
+        )
+        if settings.rag_semantic_cache_threshold > 0
+        else None
+    )
+)
 
 
 # Convenience functions
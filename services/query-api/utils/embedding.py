@@ -1,7 +1,12 @@
 import os
-from typing import List, Optional
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import numpy as np
 
 from config import settings
+from utils.hashing import hash_key
 
 # Lazy load to avoid import time overhead
 _embedder: Optional["SentenceTransformerEmbedder"] = None
@@ -11,8 +16,16 @@ class SentenceTransformerEmbedder:
     """Semantic embedder optimized for CPU using FastEmbed."""
 
     def __init__(
-        self, model_name: str = "intfloat/multilingual-e5-large", dim: int = 1024
+        self,
+        model_name: str = "intfloat/multilingual-e5-large",
+        dim: int = 1024,
+        cache_size: int = 10000,
     ):
+        # Repeated queries skip the forward pass; vectors are kept as float16
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[int, np.ndarray]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+
         try:
             from fastembed import TextEmbedding
 
@@ -33,8 +46,13 @@ class SentenceTransformerEmbedder:
             print(f"✓ FastEmbed model loaded: {model_name}")
         except Exception as e:
             print(f"⚠ FastEmbed load failed, falling back to SentenceTransformers: {e}")
+            import torch
             from sentence_transformers import SentenceTransformer
 
+            # torch starts one intra-op thread per visible core, which
+            # oversubscribes CPU-limited containers
+            torch.set_num_threads(min(8, os.cpu_count() or 1))
+
             self.model_name = model_name
             self.dim = dim
             cache_dir = os.environ.get(
@@ -44,38 +62,89 @@ class SentenceTransformerEmbedder:
             self.model = SentenceTransformer(model_name, cache_folder=cache_dir)
             self.backend = "sentence-transformers"
 
-    def embed(self, texts: List[str]) -> List[List[float]]:
-        """Generate embeddings for a list of texts."""
+    def embed(self, texts: List[str], batch_size: int = 64) -> np.ndarray:
+        """Generate a (len(texts), dim) float32 array of embeddings.
+
+        Vectors stay as NumPy arrays; they are only turned into JSON at the
+        Qdrant request boundary.
+        """
         if not texts:
-            return []
+            return np.empty((0, self.dim), dtype=np.float32)
 
         if self.backend == "fastembed":
+            # Encode in length order so each batch pads to similar lengths;
+            # sentence-transformers already does this inside encode()
+            order = np.argsort([len(t) for t in texts], kind="stable")
             # fastembed returns a generator
-            embeddings = list(self.model.embed(texts))
-            return [e.tolist() for e in embeddings]
+            sorted_embeddings = np.stack(
+                list(self.model.embed([texts[i] for i in order], batch_size=batch_size))
+            )
+            embeddings = np.empty_like(sorted_embeddings)
+            embeddings[order] = sorted_embeddings
         else:
             embeddings = self.model.encode(
                 texts,
                 normalize_embeddings=True,
+                batch_size=batch_size,
                 show_progress_bar=False,
             )
-            return embeddings.tolist()
-
-    def embed_query(self, query: str) -> List[float]:
+        return np.asarray(embeddings, dtype=np.float32)
+
+    def _embed_cached(self, texts: List[str]) -> np.ndarray:
+        """Embed texts, running the model only on those not seen recently."""
+        keys = [hash_key(text) for text in texts]
+        hits: Dict[int, np.ndarray] = {}
+        misses: List[int] = []
+
+        with self._cache_lock:
+            for i, key in enumerate(keys):
+                cached = self._cache.get(key)
+                if cached is None:
+                    misses.append(i)
+                else:
+                    self._cache.move_to_end(key)
+                    hits[i] = cached
+
+        fresh = self.embed([texts[i] for i in misses]) if misses else None
+
+        # Size the output from the model's vectors, not the configured
+        # embedding_dim, which can disagree with EMBEDDING_MODEL
+        if fresh is not None:
+            width = fresh.shape[1]
+        elif hits:
+            width = next(iter(hits.values())).shape[0]
+        else:
+            width = self.dim
+        result = np.empty((len(texts), width), dtype=np.float32)
+        for i, cached in hits.items():
+            result[i] = cached
+
+        if fresh is not None:
+            result[misses] = fresh
+            with self._cache_lock:
+                for i, vector in zip(misses, fresh):
+                    self._cache[keys[i]] = vector.astype(np.float16)
+                    self._cache.move_to_end(keys[i])
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+        return result
+
+    def embed_query(self, query: str) -> np.ndarray:
         """Embed a single query with query-specific prefix for bge/e5 models."""
         # BGE and E5 models benefit from "query: " prefix for queries
         if "bge" in self.model_name.lower() or "e5" in self.model_name.lower():
             query = f"query: {query}"
 
-        return self.embed([query])[0]
+        return self._embed_cached([query])[0]
 
-    def embed_documents(self, documents: List[str]) -> List[List[float]]:
+    def embed_documents(self, documents: List[str]) -> np.ndarray:
         """Embed documents with document-specific prefix for bge/e5 models."""
         # BGE and E5 models benefit from "passage: " prefix for documents
         if "bge" in self.model_name.lower() or "e5" in self.model_name.lower():
             documents = [f"passage: {doc}" for doc in documents]
 
-        return self.embed(documents)
+        return self._embed_cached(documents)
 
 
 def embedder_factory() -> SentenceTransformerEmbedder:
@@ -88,6 +157,7 @@ def embedder_factory() -> SentenceTransformerEmbedder:
         _embedder = SentenceTransformerEmbedder(
             model_name=model_name,
             dim=settings.embedding_dim,
+            cache_size=settings.embedding_cache_size,
         )
 
     return _embedder
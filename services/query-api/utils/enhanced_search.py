@@ -8,19 +8,39 @@ Provides:
 - Query similarity caching
 """
 
-import hashlib
+import functools
 import json
+import os
+import re
 import time
 import asyncio
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple, Awaitable, Callable
 from dataclasses import dataclass
-from datetime import datetime, timedelta
 from collections import OrderedDict
 from db import get_chunks_by_ids
 
+import orjson
 import redis
 
 from config import settings
+from utils.hashing import hash_key
+
+# Redis keys are laid out as qcache:{tenant_id}\x00{query_hash} so that a
+# tenant's entries can be found with a single SCAN MATCH on its prefix. The
+# NUL separator cannot occur in a tenant id, so the prefix of tenant "a" never
+# matches keys of tenant "a:b".
+CACHE_KEY_PREFIX = "qcache"
+TENANT_KEY_SEPARATOR = "\x00"
+_GLOB_SPECIAL = re.compile(r"([*?\[\]\\])")
+
+
+@functools.lru_cache(maxsize=4096)
+def _query_key(normalized_query: str, tenant_id: Optional[str]) -> str:
+    """Build the cache key for a normalized query; repeats skip hashing."""
+    return (
+        f"{CACHE_KEY_PREFIX}:{tenant_id or ''}{TENANT_KEY_SEPARATOR}"
+        f"{hash_key(normalized_query):032x}"
+    )
 
 
 @dataclass
@@ -60,15 +80,37 @@ class QueryCache:
         self.ttl = ttl or settings.query_cache_ttl
         self.max_size = max_size or settings.query_cache_max_size
         self.enable_l1 = enable_l1
+        self._ttl_ns = self.ttl * 1_000_000_000
 
         self._redis: Optional[redis.Redis] = None
-        self._l1_cache: OrderedDict = OrderedDict()
-        self._l1_ttl: Dict[str, datetime] = {}
+        # key -> (result, deadline in time.monotonic_ns() units, tenant_id)
+        self._l1: "OrderedDict[str, Tuple[Any, int, str]]" = OrderedDict()
+        # Last-used (key, value, deadline): repeats of the same query skip L1
+        self._lu: Tuple[Optional[str], Any, int] = (None, None, 0)
         self._lock = asyncio.Lock()
+        # key -> [lock, waiter count]; only held while a miss is being filled
+        self._key_locks: Dict[str, List[Any]] = {}
         self._stats = CacheStats(max_size=self.max_size)
+        self._snapshot_task: Optional[asyncio.Task] = None
+        self._snapshot_path: Optional[str] = None
 
     async def initialize(self):
-        """Initialize Redis connection."""
+        """Initialize Redis connection and, if configured, L1 snapshots."""
+        path = settings.query_cache_snapshot_path
+        if path and self.enable_l1 and self._snapshot_task is None:
+            try:
+                # File I/O and parsing run in a worker thread; only the L1
+                # inserts happen on the event loop
+                entries = await asyncio.to_thread(self._read_snapshot, path)
+                restored = self._restore_entries(entries)
+                print(f"✓ Query cache restored {restored} entries from {path}")
+            except Exception as e:
+                print(f"⚠ Query cache snapshot restore failed: {e}")
+            self._snapshot_path = path
+            self._snapshot_task = asyncio.create_task(
+                self._snapshot_loop(path, settings.query_cache_snapshot_interval)
+            )
+
         try:
             self._redis = redis.from_url(
                 self.redis_url,
@@ -84,17 +126,16 @@ class QueryCache:
 
     def _normalize_query(self, query: str) -> str:
         """Normalize query for cache key consistency."""
-        normalized = " ".join(query.lower().strip().split())
-        return normalized
+        # str.split() with no separator already trims and collapses whitespace
+        return " ".join(query.lower().split())
+
+    def _tenant_prefix(self, tenant_id: str = None) -> str:
+        """Key prefix shared by every cached query of a tenant."""
+        return f"{CACHE_KEY_PREFIX}:{tenant_id or ''}{TENANT_KEY_SEPARATOR}"
 
     def _generate_key(self, query: str, tenant_id: str = None) -> str:
         """Generate cache key for a query."""
-        normalized = self._normalize_query(query)
-        key_data = {"q": normalized}
-        if tenant_id:
-            key_data["t"] = tenant_id
-        key_str = json.dumps(key_data, sort_keys=True)
-        return f"query:{hashlib.md5(key_str.encode()).hexdigest()}"
+        return _query_key(self._normalize_query(query), tenant_id)
 
     async def get(self, query: str, tenant_id: str = None) -> Optional[Any]:
         """
@@ -107,19 +148,32 @@ class QueryCache:
         Returns:
             Cached result or None if not found
         """
-        key = self._generate_key(query, tenant_id)
+        return await self._lookup(self._generate_key(query, tenant_id), tenant_id)
+
+    async def _lookup(
+        self, key: str, tenant_id: str = None, record_stats: bool = True
+    ) -> Optional[Any]:
+        """Read a key from L1, then L2, promoting L2 hits into L1."""
+        lu_key, lu_value, lu_deadline = self._lu
+        if key == lu_key and time.monotonic_ns() < lu_deadline:
+            if record_stats:
+                self._stats.hits += 1
+            return lu_value
 
         async with self._lock:
             if self.enable_l1:
-                if key in self._l1_cache:
-                    expiry = self._l1_ttl.get(key)
-                    if expiry is None or datetime.now() < expiry:
-                        self._stats.hits += 1
-                        return self._l1_cache[key]
-                    else:
-                        del self._l1_cache[key]
-                        del self._l1_ttl[key]
-                self._stats.misses += 1
+                entry = self._l1.get(key)
+                if entry is not None:
+                    value, deadline, _ = entry
+                    if time.monotonic_ns() < deadline:
+                        self._l1.move_to_end(key)
+                        self._lu = (key, value, deadline)
+                        if record_stats:
+                            self._stats.hits += 1
+                        return value
+                    self._l1_remove(key)
+                if record_stats:
+                    self._stats.misses += 1
 
         if self._redis:
             try:
@@ -128,9 +182,11 @@ class QueryCache:
                     result = json.loads(data)
                     if self.enable_l1:
                         async with self._lock:
-                            self._l1_cache[key] = result
-                            self._l1_ttl[key] = datetime.now() + timedelta(
-                                seconds=self.ttl
+                            self._l1_put(
+                                key,
+                                tenant_id,
+                                result,
+                                time.monotonic_ns() + self._ttl_ns,
                             )
                     return result
             except Exception as e:
@@ -138,6 +194,20 @@ class QueryCache:
 
         return None
 
+    def _l1_put(self, key: str, tenant_id: str, result: Any, deadline: int):
+        """Insert as most recently used, evicting LRU entries over max_size."""
+        self._l1[key] = (result, deadline, tenant_id or "")
+        self._l1.move_to_end(key)
+        self._lu = (key, result, deadline)
+        while len(self._l1) > self.max_size:
+            self._l1_remove(next(iter(self._l1)))
+
+    def _l1_remove(self, key: str):
+        """Drop a key from L1 and the last-used slot."""
+        if self._lu[0] == key:
+            self._lu = (None, None, 0)
+        self._l1.pop(key, None)
+
     async def set(
         self,
         query: str,
@@ -154,18 +224,16 @@ class QueryCache:
             tenant_id: Tenant identifier
             ttl: Override TTL in seconds
         """
-        key = self._generate_key(query, tenant_id)
+        await self._store(self._generate_key(query, tenant_id), tenant_id, result, ttl)
+
+    async def _store(self, key: str, tenant_id: str, result: Any, ttl: int = None):
+        """Write a result to L1 and L2 under an already derived key."""
         cache_ttl = ttl or self.ttl
+        ttl_ns = cache_ttl * 1_000_000_000 if ttl else self._ttl_ns
 
         if self.enable_l1:
             async with self._lock:
-                if key in self._l1_cache:
-                    self._l1_cache.move_to_end(key)
-                else:
-                    while len(self._l1_cache) >= self.max_size:
-                        self._l1_cache.popitem(last=False)
-                self._l1_cache[key] = result
-                self._l1_ttl[key] = datetime.now() + timedelta(seconds=cache_ttl)
+                self._l1_put(key, tenant_id, result, time.monotonic_ns() + ttl_ns)
 
         if self._redis:
             try:
@@ -174,13 +242,92 @@ class QueryCache:
             except Exception as e:
                 print(f"Query cache Redis set error: {e}")
 
+    async def set_many(
+        self,
+        items: List[Tuple[str, Optional[str], Any]],
+        ttl: int = None,
+    ):
+        """
+        Cache several query results with one Redis round-trip.
+
+        Args:
+            items: (query, tenant_id, result) tuples
+            ttl: Override TTL in seconds
+        """
+        cache_ttl = ttl or self.ttl
+        deadline = time.monotonic_ns() + (
+            cache_ttl * 1_000_000_000 if ttl else self._ttl_ns
+        )
+        keyed = [
+            (self._generate_key(query, tenant_id), tenant_id, result)
+            for query, tenant_id, result in items
+        ]
+
+        if self.enable_l1:
+            async with self._lock:
+                for key, tenant_id, result in keyed:
+                    self._l1_put(key, tenant_id, result, deadline)
+
+        if self._redis and keyed:
+            try:
+                pipe = self._redis.pipeline(transaction=False)
+                for key, _, result in keyed:
+                    pipe.setex(key, cache_ttl, json.dumps(result))
+                pipe.execute()
+            except Exception as e:
+                print(f"Query cache Redis set error: {e}")
+
+    async def get_or_set(
+        self,
+        query: str,
+        tenant_id: str,
+        factory: Callable[[], Awaitable[Any]],
+        ttl: int = None,
+    ) -> Tuple[Any, bool]:
+        """
+        Return the cached result for a query, computing it on a miss.
+
+        The key is derived once, and concurrent misses on the same key share
+        a lock so only the first caller runs the factory.
+
+        Args:
+            query: Search query
+            tenant_id: Tenant identifier
+            factory: Coroutine function producing the result on a miss
+            ttl: Override TTL in seconds
+
+        Returns:
+            Tuple of (result, whether it came from the cache)
+        """
+        key = self._generate_key(query, tenant_id)
+
+        value = await self._lookup(key, tenant_id)
+        if value:
+            return value, True
+
+        entry = self._key_locks.get(key)
+        if entry is None:
+            entry = self._key_locks[key] = [asyncio.Lock(), 0]
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                value = await self._lookup(key, tenant_id, record_stats=False)
+                if value:
+                    return value, True
+                value = await factory()
+                await self._store(key, tenant_id, value, ttl)
+                return value, False
+        finally:
+            entry[1] -= 1
+            if not entry[1]:
+                del self._key_locks[key]
+
     async def delete(self, query: str, tenant_id: str = None):
         """Delete cached result for a query."""
         key = self._generate_key(query, tenant_id)
 
         async with self._lock:
-            self._l1_cache.pop(key, None)
-            self._l1_ttl.pop(key, None)
+            self._l1_remove(key)
 
         if self._redis:
             try:
@@ -190,42 +337,138 @@ class QueryCache:
 
     async def invalidate_tenant(self, tenant_id: str):
         """Invalidate all cached results for a tenant."""
-        pattern = f"query:*"
-        keys_to_delete = []
+        prefix = self._tenant_prefix(tenant_id)
 
         if self._redis:
             try:
-                cursor = 0
-                while True:
-                    cursor, keys = self._redis.scan(cursor, match=pattern, count=100)
-                    for key in keys:
-                        if self._redis.hget(key, "tenant_id") == tenant_id:
-                            keys_to_delete.append(key)
-                    if cursor == 0:
-                        break
-                    if len(keys_to_delete) > 1000:
-                        break
-
-                if keys_to_delete:
-                    self._redis.delete(*keys_to_delete)
+                pattern = _GLOB_SPECIAL.sub(r"\\\1", prefix) + "*"
+                # Queue UNLINKs of 1000 keys each and send them in one round-trip
+                pipe = self._redis.pipeline(transaction=False)
+                batch = []
+                for key in self._redis.scan_iter(match=pattern, count=1000):
+                    batch.append(key)
+                    if len(batch) >= 1000:
+                        pipe.unlink(*batch)
+                        batch = []
+                if batch:
+                    pipe.unlink(*batch)
+                pipe.execute()
             except Exception as e:
                 print(f"Query cache tenant invalidation error: {e}")
 
+        tenant = tenant_id or ""
         async with self._lock:
-            keys_to_remove = [k for k, v in self._l1_ttl.items() if tenant_id in k]
-            for k in keys_to_remove:
-                self._l1_cache.pop(k, None)
-                self._l1_ttl.pop(k, None)
+            stale = [key for key, entry in self._l1.items() if entry[2] == tenant]
+            for key in stale:
+                self._l1_remove(key)
+
+    def snapshot(self, path: str, limit: int = 1000) -> int:
+        """
+        Write the most recently used L1 entries to disk.
+
+        Deadlines are stored as wall-clock expiry times so that another
+        process can restore them with the TTL they have left.
+
+        Returns:
+            Number of entries written
+        """
+        entries = self._snapshot_entries(limit)
+        self._write_snapshot(path, entries)
+        return len(entries)
+
+    def _snapshot_entries(self, limit: int) -> List[Tuple[str, str, float, Any]]:
+        """Collect unexpired L1 entries, most recently used first."""
+        now_ns = time.monotonic_ns()
+        now = time.time()
+        entries = []
+        for key, (value, deadline, tenant) in reversed(self._l1.items()):
+            if deadline <= now_ns:
+                continue
+            entries.append((key, tenant, now + (deadline - now_ns) / 1e9, value))
+            if len(entries) >= limit:
+                break
+        return entries
+
+    @staticmethod
+    def _write_snapshot(path: str, entries: List[Tuple[str, str, float, Any]]):
+        """Serialize entries and atomically replace the snapshot file."""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(orjson.dumps(entries))
+        os.replace(tmp_path, path)
+
+    async def _snapshot_async(self, path: str, limit: int = 1000) -> int:
+        """Snapshot L1 without blocking the event loop on serialization or I/O."""
+        # Entries are collected on the loop so L1 isn't mutated mid-iteration
+        entries = self._snapshot_entries(limit)
+        await asyncio.to_thread(self._write_snapshot, path, entries)
+        return len(entries)
+
+    def restore(self, path: str) -> int:
+        """
+        Load a snapshot written by snapshot() into L1, skipping expired entries.
+
+        Returns:
+            Number of entries restored
+        """
+        return self._restore_entries(self._read_snapshot(path))
+
+    @staticmethod
+    def _read_snapshot(path: str) -> List[Tuple[str, str, float, Any]]:
+        """Read and parse a snapshot file; a missing file is empty."""
+        if not os.path.exists(path):
+            return []
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+
+    def _restore_entries(self, entries: List[Tuple[str, str, float, Any]]) -> int:
+        """Insert snapshot entries into L1, skipping expired ones."""
+        now_ns = time.monotonic_ns()
+        now = time.time()
+        restored = 0
+        # Snapshots are MRU-first; insert oldest first to rebuild LRU order
+        for key, tenant, expires_at, value in reversed(entries):
+            if expires_at <= now:
+                continue
+            self._l1_put(key, tenant, value, now_ns + int((expires_at - now) * 1e9))
+            restored += 1
+        return restored
+
+    async def _snapshot_loop(self, path: str, interval: int):
+        """Periodically persist L1 so a restarted process starts warm."""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self._snapshot_async(path)
+            except Exception as e:
+                print(f"Query cache snapshot error: {e}")
+
+    async def close(self):
+        """Stop periodic snapshots and write a final one for the next start."""
+        if self._snapshot_task is None:
+            return
+        self._snapshot_task.cancel()
+        try:
+            await self._snapshot_task
+        except asyncio.CancelledError:
+            pass
+        self._snapshot_task = None
+        try:
+            written = await self._snapshot_async(self._snapshot_path)
+            print(f"✓ Query cache saved {written} entries to {self._snapshot_path}")
+        except Exception as e:
+            print(f"Query cache snapshot error: {e}")
 
     async def clear_all(self):
         """Clear all cached results."""
         async with self._lock:
-            self._l1_cache.clear()
-            self._l1_ttl.clear()
+            self._l1.clear()
+            self._lu = (None, None, 0)
+        _query_key.cache_clear()
 
         if self._redis:
             try:
-                pattern = "query:*"
+                pattern = f"{CACHE_KEY_PREFIX}:*"
                 cursor = 0
                 keys = []
                 while True:
@@ -244,7 +487,7 @@ class QueryCache:
                 "hits": self._stats.hits,
                 "misses": self._stats.misses,
                 "hit_rate": f"{self._stats.hit_rate:.2%}",
-                "l1_size": len(self._l1_cache),
+                "l1_size": len(self._l1),
                 "l1_max_size": self.max_size,
                 "l2_connected": self._redis is not None,
                 "ttl_seconds": self.ttl,
@@ -301,6 +544,7 @@ class EnhancedSearchEngine:
         use_hyde: bool = None,
         use_decomposition: bool = None,
         filters: dict = None,
+        query_vector: List[float] = None,
     ) -> Dict[str, Any]:
         """
         Perform enhanced search.
@@ -313,6 +557,7 @@ class EnhancedSearchEngine:
             use_hyde: Use HyDE embeddings
             use_decomposition: Use query decomposition
             filters: Additional filters
+            query_vector: Precomputed query embedding for the basic search path
 
         Returns:
             Dict with results and metadata
@@ -325,14 +570,45 @@ class EnhancedSearchEngine:
             else settings.query_decomposition_enabled
         )
 
-        cache_key = f"search:{self._generate_key(query, tenant_id, use_hyde, use_decomposition)}"
+        if not use_cache:
+            return await self._do_search(
+                query,
+                tenant_id,
+                top_k,
+                use_hyde,
+                use_decomposition,
+                filters,
+                query_vector,
+            )
 
-        if use_cache:
-            cached = await self.cache.get(query, tenant_id)
-            if cached:
-                cached["cached"] = True
-                return cached
+        response, cached = await self.cache.get_or_set(
+            query,
+            tenant_id,
+            lambda: self._do_search(
+                query,
+                tenant_id,
+                top_k,
+                use_hyde,
+                use_decomposition,
+                filters,
+                query_vector,
+            ),
+        )
+        if cached:
+            response["cached"] = True
+        return response
 
+    async def _do_search(
+        self,
+        query: str,
+        tenant_id: Optional[str],
+        top_k: int,
+        use_hyde: bool,
+        use_decomposition: bool,
+        filters: Optional[dict],
+        query_vector: Optional[List[float]] = None,
+    ) -> Dict[str, Any]:
+        """Run the uncached search pipeline and build the response."""
         if filters is None:
             filters = {}
         if tenant_id:
@@ -363,6 +639,7 @@ class EnhancedSearchEngine:
                 query=query,
                 filters=filters,
                 top_k=top_k * 2,
+                query_vector=query_vector,
             )
 
         final_results = await self._fetch_chunk_details(results, top_k)
@@ -386,9 +663,6 @@ class EnhancedSearchEngine:
                 for sq in decomposed_query.sub_queries
             ]
 
-        if use_cache:
-            await self.cache.set(query, response, tenant_id)
-
         return response
 
     async def _basic_search(
@@ -396,32 +670,53 @@ class EnhancedSearchEngine:
         query: str,
         filters: dict,
         top_k: int,
+        query_vector: List[float] = None,
     ) -> List[dict]:
-        """Perform basic hybrid search."""
+        """Perform basic hybrid search, reusing query_vector when given."""
+        if query_vector is not None:
+            embedding = query_vector
+        else:
+            embedding = (await self._embed([query]))[0]
+
+        # Both store clients are blocking; run them in worker threads so the
+        # two lookups overlap and the event loop stays free for other requests.
+        vector_results, bm25_results = await asyncio.gather(
+            self._vector_search(embedding, filters, top_k),
+            self._bm25_search(query, filters, top_k),
+        )
+
+        return self._merge_results(vector_results, bm25_results, top_k)
+
+    async def _embed(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts in one batch off the event loop."""
         if self.embedder is None:
             from embedding import embedder_factory
 
             self.embedder = embedder_factory()
 
-        embedding = self.embedder.embed([query])[0]
-
-        vector_results = []
-        if self.qdrant:
-            vector_results = self.qdrant.search(
-                vector=embedding,
-                limit=top_k,
-                filters=filters,
-            )
+        return await asyncio.to_thread(self.embedder.embed, texts)
 
-        bm25_results = []
-        if self.opensearch:
-            bm25_results = self.opensearch.bm25_search(
-                query=query,
-                k=top_k,
-                filters=filters,
-            )
+    async def _vector_search(self, embedding, filters: dict, top_k: int) -> List:
+        """Run the Qdrant search off the event loop."""
+        if not self.qdrant:
+            return []
+        return await asyncio.to_thread(
+            self.qdrant.search,
+            vector=embedding,
+            limit=top_k,
+            filters=filters,
+        )
 
-        return self._merge_results(vector_results, bm25_results, top_k)
+    async def _bm25_search(self, query: str, filters: dict, top_k: int) -> dict:
+        """Run the OpenSearch BM25 query off the event loop."""
+        if not self.opensearch:
+            return {}
+        return await asyncio.to_thread(
+            self.opensearch.bm25_search,
+            query=query,
+            k=top_k,
+            filters=filters,
+        )
 
     def _merge_results(
         self,
@@ -503,14 +798,12 @@ class EnhancedSearchEngine:
         use_decomposition: bool = False,
     ) -> str:
         """Generate cache key with modifiers."""
-        parts = [query]
-        if tenant_id:
-            parts.append(tenant_id)
-        if use_hyde:
-            parts.append("hyde")
-        if use_decomposition:
-            parts.append("decomp")
-        return ":".join(parts)
+        # Fixed field order over primitives; NUL cannot appear in any field
+        key = hash_key(
+            f"{tenant_id or ''}\x00{' '.join(query.lower().split())}\x00"
+            f"{int(bool(use_hyde))}{int(bool(use_decomposition))}"
+        )
+        return f"{key:032x}"
 
     async def warm_cache(self, queries: List[Dict[str, Any]]):
         """
@@ -520,16 +813,38 @@ class EnhancedSearchEngine:
             queries: List of dicts with 'query', 'tenant_id', 'top_k' keys
         """
         print(f"Warming cache with {len(queries)} queries...")
-        for q in queries:
+
+        # One batched embedder call is far cheaper than one call per query
+        try:
+            vectors = await self._embed([q["query"] for q in queries])
+        except Exception as e:
+            print(f"Cache warming embedding error: {e}")
+            vectors = [None] * len(queries)
+
+        async def warm(q: Dict[str, Any], vector: Optional[List[float]]):
             try:
-                await self.search(
+                return await self.search(
                     query=q["query"],
                     tenant_id=q.get("tenant_id"),
                     top_k=q.get("top_k", 10),
-                    use_cache=True,
+                    use_cache=False,
+                    query_vector=vector,
                 )
             except Exception as e:
                 print(f"Cache warming error for '{q['query']}': {e}")
+                return None
+
+        responses = await asyncio.gather(
+            *(warm(q, vec) for q, vec in zip(queries, vectors))
+        )
+        # Store every warmed result in one batch instead of a write per query
+        await self.cache.set_many(
+            [
+                (q["query"], q.get("tenant_id"), response)
+                for q, response in zip(queries, responses)
+                if response is not None
+            ]
+        )
         print("Cache warming complete.")
 
     def get_cache_stats(self) -> Dict[str, Any]:
@@ -547,6 +862,11 @@ async def get_query_cache() -> QueryCache:
     return _query_cache
 
 
+async def close_query_cache():
+    """Flush and stop the global query cache's background snapshots."""
+    await _query_cache.close()
+
+
 async def get_enhanced_search_engine() -> EnhancedSearchEngine:
     """Create and configure an enhanced search engine."""
     cache = await get_query_cache()
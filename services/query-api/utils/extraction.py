@@ -8,18 +8,49 @@ This module provides:
 - Database storage of extracted data
 """
 
+import asyncio
 import json
 import logging
 from typing import Dict, Any, List, Optional
 from dataclasses import dataclass
 
 import httpx
+import orjson
 
 from config import settings
 from utils.prompt_builder import RAGPromptBuilder, ContextChunk
 
 logger = logging.getLogger("extraction")
 
+# Shared client so extractions reuse pooled (and HTTP/2 multiplexed)
+# connections to the query API and LLM gateway instead of reconnecting.
+_client: Optional[httpx.AsyncClient] = None
+_client_lock = asyncio.Lock()
+
+
+async def get_http_client() -> httpx.AsyncClient:
+    """Get or create the shared HTTP client."""
+    global _client
+    if _client is None:
+        async with _client_lock:
+            if _client is None:
+                _client = httpx.AsyncClient(
+                    http2=True,
+                    timeout=30,
+                    limits=httpx.Limits(
+                        max_keepalive_connections=32, max_connections=64
+                    ),
+                )
+    return _client
+
+
+async def close_http_client():
+    """Close the shared HTTP client."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
 
 @dataclass
 class ExtractionResult:
@@ -45,7 +76,7 @@ class ExtractionService:
         self.query_api_url = query_api_url or settings.query_api_url
         self.prompt_builder = RAGPromptBuilder()
 
-    def extract_from_search(
+    async def extract_from_search(
         self,
         query: str,
         tenant_id: str,
@@ -69,7 +100,7 @@ class ExtractionService:
         """
         try:
             # Step 1: Search for relevant context
-            search_results = self._search_context(query, tenant_id, top_k)
+            search_results = await self._search_context(query, tenant_id, top_k)
 
             if not search_results:
                 return ExtractionResult(
@@ -88,7 +119,7 @@ class ExtractionService:
             )
 
             # Step 3: Extract structured data
-            extraction_result = self._call_extraction_endpoint(
+            extraction_result = await self._call_extraction_endpoint(
                 prompt=prompt,
                 schema=extraction_schema,
             )
@@ -112,7 +143,7 @@ class ExtractionService:
                 validation_errors=[str(e)],
             )
 
-    def extract_from_text(
+    async def extract_from_text(
         self,
         text: str,
         extraction_task: str,
@@ -141,7 +172,7 @@ Extraction Task: {extraction_task}
 Extract the information and return as JSON."""
 
             # Call extraction endpoint
-            extraction_result = self._call_extraction_endpoint(
+            extraction_result = await self._call_extraction_endpoint(
                 prompt=prompt,
                 schema=extraction_schema,
             )
@@ -161,7 +192,7 @@ Extract the information and return as JSON."""
                 validation_errors=[str(e)],
             )
 
-    def _search_context(
+    async def _search_context(
         self,
         query: str,
         tenant_id: str,
@@ -177,9 +208,10 @@ Extract the information and return as JSON."""
         }
 
         try:
-            resp = httpx.post(url, json=payload, timeout=30)
+            client = await get_http_client()
+            resp = await client.post(url, json=payload, timeout=30)
             resp.raise_for_status()
-            data = resp.json()
+            data = orjson.loads(resp.content)
             return data.get("results", [])
         except Exception as e:
             logger.error(f"Search failed: {e}")
@@ -205,7 +237,7 @@ Extract the information and return as JSON."""
             chunks.append(chunk)
         return chunks
 
-    def _call_extraction_endpoint(
+    async def _call_extraction_endpoint(
         self,
         prompt: str,
         schema: Dict[str, Any],
@@ -221,9 +253,10 @@ Extract the information and return as JSON."""
         }
 
         try:
-            resp = httpx.post(url, json=payload, timeout=120)
+            client = await get_http_client()
+            resp = await client.post(url, json=payload, timeout=120)
             resp.raise_for_status()
-            data = resp.json()
+            data = orjson.loads(resp.content)
 
             return ExtractionResult(
                 success=data.get("confidence", 0) >= 0.7
@@ -331,7 +364,7 @@ if __name__ == "__main__":
     print(sample_text)
 
     # This would normally call the LLM
-    print("\nTo extract data, initialize the service and call extract_from_text()")
+    print("\nTo extract data, initialize the service and await extract_from_text()")
     print(
-        "ExtractionService().extract_from_text(sample_text, 'Extract person info', person_schema)"
+        "await ExtractionService().extract_from_text(sample_text, 'Extract person info', person_schema)"
     )
@@ -0,0 +1,14 @@
+from typing import Union
+
+import xxhash
+
+
+def hash_key(data: Union[str, bytes]) -> int:
+    """Fast non-cryptographic 128-bit digest for cache keys.
+
+    In-process caches use the int directly; Redis keys format it with
+    ``f"{hash_key(data):032x}"``.
+    """
+    if isinstance(data, str):
+        data = data.encode()
+    return xxhash.xxh3_128_intdigest(data)
@@ -9,12 +9,34 @@ HyDE improves search quality by:
 Reference: https://arxiv.org/abs/2212.10496
 """
 
-import hashlib
+import asyncio
+import heapq
+import threading
 import httpx
-from typing import List, Tuple, Dict
+import numpy as np
+from collections import OrderedDict
+from operator import itemgetter
+from typing import Any, Callable, List, Optional, Tuple
 from dataclasses import dataclass
 
 from config import settings
+from utils.hashing import hash_key
+
+
+def _lru_get(cache: OrderedDict, key: int) -> Optional[Any]:
+    """Return a cached value and mark it most recently used."""
+    value = cache.get(key)
+    if value is not None:
+        cache.move_to_end(key)
+    return value
+
+
+def _lru_put(cache: OrderedDict, key: int, value: Any, max_size: int):
+    """Insert a value, evicting least recently used entries over max_size."""
+    cache[key] = value
+    cache.move_to_end(key)
+    while len(cache) > max_size:
+        cache.popitem(last=False)
 
 
 @dataclass
@@ -26,6 +48,76 @@ class HypotheticalDocument:
     embedding: List[float]
 
 
+class SemanticHypotheticalCache:
+    """
+    Nearest-neighbour cache of hypothetical documents keyed by query meaning.
+
+    Paraphrased queries ("What is ML?" / "Explain machine learning") miss the
+    exact-match cache but land close together in embedding space. Query
+    vectors are L2-normalized and kept in a fixed-size matrix, so a lookup is
+    one inner-product scan; the least recently used slot is reused when full.
+    """
+
+    def __init__(
+        self,
+        embed_fn: Callable[[List[str]], List[List[float]]],
+        threshold: float = 0.92,
+        max_size: int = 1024,
+    ):
+        self.embed_fn = embed_fn
+        self.threshold = threshold
+        self.max_size = max_size
+        self._vectors: Optional[np.ndarray] = None
+        self._docs: List[Optional[HypotheticalDocument]] = [None] * max_size
+        self._last_used = np.zeros(max_size, dtype=np.int64)
+        self._size = 0
+        self._tick = 0
+        self._lock = threading.Lock()
+
+    def embed(self, query: str) -> np.ndarray:
+        """Embed and L2-normalize a query."""
+        vector = np.asarray(self.embed_fn([query])[0], dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    def lookup(self, vector: np.ndarray) -> Optional[HypotheticalDocument]:
+        """Return the cached document for the most similar query above threshold."""
+        with self._lock:
+            if self._size == 0:
+                return None
+            scores = self._vectors[: self._size] @ vector
+            best = int(np.argmax(scores))
+            if scores[best] < self.threshold:
+                return None
+            self._tick += 1
+            self._last_used[best] = self._tick
+            return self._docs[best]
+
+    def add(self, vector: np.ndarray, doc: HypotheticalDocument):
+        """Store a document under its normalized query vector."""
+        with self._lock:
+            if self._vectors is None:
+                self._vectors = np.zeros(
+                    (self.max_size, vector.shape[0]), dtype=np.float32
+                )
+            if self._size < self.max_size:
+                slot = self._size
+                self._size += 1
+            else:
+                slot = int(np.argmin(self._last_used))
+            self._tick += 1
+            self._vectors[slot] = vector
+            self._docs[slot] = doc
+            self._last_used[slot] = self._tick
+
+    def clear(self):
+        """Drop all cached documents."""
+        with self._lock:
+            self._docs = [None] * self.max_size
+            self._last_used[:] = 0
+            self._size = 0
+
+
 class HyDEGenerator:
     """Generates hypothetical documents for queries using LLM."""
 
@@ -34,11 +126,17 @@ class HyDEGenerator:
         llm_gateway_url: str = None,
         max_length: int = None,
         temperature: float = None,
+        cache_size: int = 1024,
+        semantic_cache: Optional[SemanticHypotheticalCache] = None,
     ):
         self.llm_gateway_url = llm_gateway_url or settings.llm_gateway_url
         self.max_length = max_length or settings.hyde_max_length
         self.temperature = temperature or settings.hyde_temperature
-        self._hyde_cache: Dict[str, HypotheticalDocument] = {}
+        self.cache_size = cache_size
+        # Only touched between awaits, so the event loop serializes access
+        self._hyde_cache: "OrderedDict[int, HypotheticalDocument]" = OrderedDict()
+        # Optional second tier that also matches paraphrases of cached queries
+        self.semantic_cache = semantic_cache
 
     def _generate_hyde_prompt(self, query: str) -> str:
         """Generate the prompt for creating a hypothetical document."""
@@ -66,10 +164,22 @@ Hypothetical Answer:"""
         Returns:
             HypotheticalDocument with the generated answer
         """
-        cache_key = hashlib.md5(query.encode()).hexdigest()
-
-        if use_cache and cache_key in self._hyde_cache:
-            return self._hyde_cache[cache_key]
+        cache_key = hash_key(query)
+
+        if use_cache:
+            cached = _lru_get(self._hyde_cache, cache_key)
+            if cached is not None:
+                return cached
+
+        query_vector = None
+        if self.semantic_cache is not None:
+            # Embedding is a blocking model forward pass
+            query_vector = await asyncio.to_thread(self.semantic_cache.embed, query)
+            if use_cache:
+                similar = self.semantic_cache.lookup(query_vector)
+                if similar is not None:
+                    _lru_put(self._hyde_cache, cache_key, similar, self.cache_size)
+                    return similar
 
         try:
             async with httpx.AsyncClient() as client:
@@ -89,6 +199,8 @@ Hypothetical Answer:"""
         except Exception as e:
             print(f"HyDE generation failed: {e}")
             hypothetical_answer = f"Answer about {query}"
+            # Don't let a placeholder answer be served to paraphrases
+            query_vector = None
 
         doc = HypotheticalDocument(
             query=query,
@@ -96,20 +208,50 @@ Hypothetical Answer:"""
             embedding=[],
         )
 
-        self._hyde_cache[cache_key] = doc
+        _lru_put(self._hyde_cache, cache_key, doc, self.cache_size)
+        if query_vector is not None:
+            self.semantic_cache.add(query_vector, doc)
         return doc
 
+    async def warmup(self, queries: List[str], concurrency: int = 8):
+        """
+        Pre-populate the cache with hypothetical documents for common queries.
+
+        Args:
+            queries: Queries expected to recur (e.g. FAQ questions)
+            concurrency: Maximum concurrent LLM gateway calls
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _generate(query: str):
+            async with semaphore:
+                await self.generate_hypothetical(query)
+
+        await asyncio.gather(*(_generate(q) for q in queries))
+
     def clear_cache(self):
         """Clear the HyDE cache."""
         self._hyde_cache.clear()
+        if self.semantic_cache is not None:
+            self.semantic_cache.clear()
 
 
 class HyDEEmbedder:
     """Embeds hypothetical documents using the embedder."""
 
-    def __init__(self, embedder=None):
+    def __init__(
+        self, embedder=None, cache_size: int = 1024, cache_dtype: Optional[str] = None
+    ):
         self._embedder = embedder
-        self._embedding_cache: Dict[str, List[float]] = {}
+        self.cache_size = cache_size
+        # Compact storage for cached vectors; empty keeps full float32
+        dtype = (
+            settings.hyde_embedding_cache_dtype if cache_dtype is None else cache_dtype
+        )
+        self.cache_dtype = np.dtype(dtype or np.float32)
+        self._embedding_cache: "OrderedDict[int, Any]" = OrderedDict()
+        # Embedding runs synchronously, possibly from worker threads
+        self._cache_lock = threading.Lock()
 
     def _get_embedder(self):
         """Get or create the embedder."""
@@ -119,9 +261,45 @@ class HyDEEmbedder:
             self._embedder = embedder_factory()
         return self._embedder
 
+    def _cache_key(self, text: str) -> int:
+        """Key embeddings by model as well as text to avoid cross-model hits."""
+        model_name = getattr(self._get_embedder(), "model_name", "")
+        return hash_key(f"{model_name}\0{text}")
+
+    def _pack(self, embedding: np.ndarray) -> np.ndarray:
+        """Convert an embedding to its cached representation."""
+        return np.array(embedding, dtype=self.cache_dtype)
+
+    @staticmethod
+    def _unpack(cached: Any) -> np.ndarray:
+        """Restore a cached embedding as a float32 copy callers may modify."""
+        return np.array(cached, dtype=np.float32)
+
+    def _embed_cached(self, text: str, use_cache: bool) -> np.ndarray:
+        """Embed a single text through the bounded LRU cache."""
+        cache_key = self._cache_key(text)
+
+        if use_cache:
+            with self._cache_lock:
+                cached = _lru_get(self._embedding_cache, cache_key)
+            if cached is not None:
+                return self._unpack(cached)
+
+        # Hits and misses both return float32 arrays
+        embedding = np.asarray(self._get_embedder().embed([text])[0], dtype=np.float32)
+
+        with self._cache_lock:
+            _lru_put(
+                self._embedding_cache,
+                cache_key,
+                self._pack(embedding),
+                self.cache_size,
+            )
+        return embedding
+
     def embed_hypothetical(
         self, hypothetical: HypotheticalDocument, use_cache: bool = True
-    ) -> List[float]:
+    ) -> np.ndarray:
         """
         Generate embedding for a hypothetical document.
 
@@ -132,24 +310,56 @@ class HyDEEmbedder:
         Returns:
             Embedding vector
         """
-        cache_key = hashlib.md5(hypothetical.hypothetical_answer.encode()).hexdigest()
+        return self._embed_cached(hypothetical.hypothetical_answer, use_cache)
 
-        if use_cache and cache_key in self._embedding_cache:
-            return self._embedding_cache[cache_key]
+    def embed_hypothetical_batch(
+        self, hypotheticals: List[HypotheticalDocument], use_cache: bool = True
+    ) -> List[np.ndarray]:
+        """
+        Embed several hypothetical documents with at most one embedder call.
 
-        embedder = self._get_embedder()
-        embeddings = embedder.embed([hypothetical.hypothetical_answer])
-        embedding = embeddings[0]
+        Args:
+            hypotheticals: The hypothetical documents to embed
+            use_cache: Whether to use cached embeddings
 
-        self._embedding_cache[cache_key] = embedding
-        return embedding
+        Returns:
+            Embedding vectors in input order
+        """
+        keys = [self._cache_key(h.hypothetical_answer) for h in hypotheticals]
+        embeddings: List[Optional[np.ndarray]] = [None] * len(hypotheticals)
+        misses: List[int] = []
+
+        with self._cache_lock:
+            for i, key in enumerate(keys):
+                cached = _lru_get(self._embedding_cache, key) if use_cache else None
+                if cached is None:
+                    misses.append(i)
+                else:
+                    embeddings[i] = self._unpack(cached)
+
+        if misses:
+            fresh = self._get_embedder().embed(
+                [hypotheticals[i].hypothetical_answer for i in misses]
+            )
+            with self._cache_lock:
+                for i, embedding in zip(misses, fresh):
+                    embedding = np.asarray(embedding, dtype=np.float32)
+                    embeddings[i] = embedding
+                    _lru_put(
+                        self._embedding_cache,
+                        keys[i],
+                        self._pack(embedding),
+                        self.cache_size,
+                    )
+
+        return embeddings
 
     def embed_query(
         self,
         query: str,
         hypothetical: HypotheticalDocument = None,
         use_cache: bool = True,
-    ) -> List[float]:
+    ) -> np.ndarray:
         """
         Embed either a hypothetical document or the original query.
 
@@ -164,21 +374,12 @@ class HyDEEmbedder:
         if hypothetical:
             return self.embed_hypothetical(hypothetical, use_cache)
 
-        cache_key = hashlib.md5(query.encode()).hexdigest()
-
-        if use_cache and cache_key in self._embedding_cache:
-            return self._embedding_cache[cache_key]
-
-        embedder = self._get_embedder()
-        embeddings = embedder.embed([query])
-        embedding = embeddings[0]
-
-        self._embedding_cache[cache_key] = embedding
-        return embedding
+        return self._embed_cached(query, use_cache)
 
     def clear_cache(self):
         """Clear all caches."""
-        self._embedding_cache.clear()
+        with self._cache_lock:
+            self._embedding_cache.clear()
 
 
 class HyDESearchEngine:
@@ -237,37 +438,53 @@ class HyDESearchEngine:
         if tenant_id:
             filters["tenant_id"] = tenant_id
 
-        hypothetical = None
-        embedding = None
-
-        if use_hyde:
-            hypothetical = await self.hyde_generator.generate_hypothetical(query)
-            embedding = self.hyde_embedder.embed_query(query, hypothetical)
-        else:
-            embedding = self.hyde_embedder.embed_query(query)
+        # BM25 only needs the raw query, so it runs while the hypothetical
+        # document is generated and embedded instead of after it
+        (hypothetical, embedding), bm25_results = await asyncio.gather(
+            self._embed_for_search(query, use_hyde),
+            self._bm25_search(query, top_k, filters),
+        )
 
         vector_results = []
         if self.qdrant:
-            vector_results = self.qdrant.search(
+            vector_results = await asyncio.to_thread(
+                self.qdrant.search,
                 vector=embedding,
                 limit=top_k * 2,
                 filters=filters if filters else None,
             )
 
-        bm25_results = []
-        if self.opensearch:
-            bm25_results = self.opensearch.bm25_search(
-                query=query,
-                k=top_k * 2,
-                filters=filters,
-            )
-
         results = self._merge_results(vector_results, bm25_results, top_k)
 
         return results, hypothetical
 
+    async def _embed_for_search(
+        self, query: str, use_hyde: bool
+    ) -> Tuple[Optional[HypotheticalDocument], np.ndarray]:
+        """Generate (optionally) and embed off the event loop."""
+        if not use_hyde:
+            embedding = await asyncio.to_thread(self.hyde_embedder.embed_query, query)
+            return None, embedding
+
+        hypothetical = await self.hyde_generator.generate_hypothetical(query)
+        embedding = await asyncio.to_thread(
+            self.hyde_embedder.embed_query, query, hypothetical
+        )
+        return hypothetical, embedding
+
+    async def _bm25_search(self, query: str, top_k: int, filters: dict) -> dict:
+        """Run the BM25 search off the event loop."""
+        if not self.opensearch:
+            return {}
+        return await asyncio.to_thread(
+            self.opensearch.bm25_search,
+            query=query,
+            k=top_k * 2,
+            filters=filters,
+        )
+
     def _merge_results(
-        self, vector_results: List, bm25_results: List, top_k: int
+        self, vector_results: List, bm25_results: dict, top_k: int
     ) -> List[dict]:
         """Merge vector and BM25 search results."""
         from fusion import rrf_fusion
@@ -284,20 +501,51 @@ class HyDESearchEngine:
             chunk_index = hit["_source"]["chunk_index"]
             b_rank.append((f"{doc_id}:{chunk_index}", float(hit.get("_score", 0.0))))
 
-        v_scores = {k: s for k, s in v_rank}
-        b_scores = {k: s for k, s in b_rank}
-
         if settings.fusion_method == "weighted":
             from fusion import weighted_fusion
 
-            fusion_scores = weighted_fusion(v_scores, b_scores)
+            fusion_scores = weighted_fusion(dict(v_rank), dict(b_rank))
         else:
             fusion_scores = rrf_fusion([v_rank, b_rank])
 
-        ranked = sorted(fusion_scores.items(), key=lambda x: x[1], reverse=True)
-        return [{"id": item_id, "score": score} for item_id, score in ranked[:top_k]]
+        # Partial selection: only the top_k entries need ordering
+        ranked = heapq.nlargest(top_k, fusion_scores.items(), key=itemgetter(1))
+        return [{"id": item_id, "score": score} for item_id, score in ranked]
 
     def clear_caches(self):
         """Clear all internal caches."""
         self.hyde_generator.clear_cache()
         self.hyde_embedder.clear_cache()
+
+
+_hyde_generator: Optional[HyDEGenerator] = None
+
+
+def get_hyde_generator() -> HyDEGenerator:
+    """Get or create the global HyDE generator so its caches outlive requests."""
+    global _hyde_generator
+    if _hyde_generator is None:
+        semantic_cache = None
+        if settings.hyde_semantic_cache_threshold > 0:
+            from utils.embedding import embedder_factory
+
+            semantic_cache = SemanticHypotheticalCache(
+                embedder_factory().embed,
+                threshold=settings.hyde_semantic_cache_threshold,
+                max_size=settings.hyde_semantic_cache_size,
+            )
+        _hyde_generator = HyDEGenerator(semantic_cache=semantic_cache)
+    return _hyde_generator
+
+
+_hyde_embedder: Optional[HyDEEmbedder] = None
+
+
+def get_hyde_embedder() -> HyDEEmbedder:
+    """Get or create the global HyDE embedder so its cache outlives requests."""
+    global _hyde_embedder
+    if _hyde_embedder is None:
+        from utils.embedding import embedder_factory
+
+        _hyde_embedder = HyDEEmbedder(embedder_factory())
+    return _hyde_embedder
@@ -4,11 +4,29 @@ RAG Prompt Builder Module
 Builds structured prompts for LLM inference with citations and context.
 """
 
+import functools
+import json
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
 
 
-@dataclass
+@functools.lru_cache(maxsize=4096)
+def _format_citation(
+    doc_id: str, source: str, source_id: str, version: int, heading_path: tuple
+) -> str:
+    """Format a citation string; repeat documents across prompts skip formatting."""
+    citation_parts = [
+        f"[{doc_id}]",
+        f"Source: {source}",
+        f"ID: {source_id}",
+        f"v{version}",
+    ]
+    if heading_path:
+        citation_parts.append(f"Section: {' > '.join(heading_path)}")
+    return " | ".join(citation_parts)
+
+
+@dataclass(slots=True, frozen=True)
 class ContextChunk:
     """A context chunk with citation information."""
 
@@ -24,15 +42,13 @@ class ContextChunk:
 
     def get_citation(self) -> str:
         """Generate a citation string for this chunk."""
-        citation_parts = [
-            f"[{self.doc_id}]",
-            f"Source: {self.source}",
-            f"ID: {self.source_id}",
-            f"v{self.version}",
-        ]
-        if self.heading_path:
-            citation_parts.append(f"Section: {' > '.join(self.heading_path)}")
-        return " | ".join(citation_parts)
+        return _format_citation(
+            self.doc_id,
+            self.source,
+            self.source_id,
+            self.version,
+            tuple(self.heading_path or ()),
+        )
 
 
 class RAGPromptBuilder:
@@ -47,9 +63,14 @@ Follow these rules:
 4. Be concise and accurate
 5. If multiple sources provide the same information, cite all of them"""
 
+    # Formatted schema descriptions kept per builder (oldest dropped first)
+    SCHEMA_CACHE_SIZE = 128
+
     def __init__(self, max_context_length: int = 4000, citation_format: str = "inline"):
         self.max_context_length = max_context_length
         self.citation_format = citation_format
+        # Canonical schema JSON -> formatted description; schemas repeat a lot
+        self._schema_cache: Dict[str, str] = {}
 
     def build_prompt(
         self,
@@ -73,9 +94,15 @@ Follow these rules:
         total_length = 0
 
         for i, chunk in enumerate(context_chunks, 1):
-            chunk_text = f"\n[Document {i}]\n"
-            chunk_text += f"Citation: {chunk.get_citation()}\n"
-            chunk_text += f"Content: {chunk.text}\n"
+            # Stop before formatting once even the bare text cannot fit
+            if total_length + len(chunk.text) > self.max_context_length:
+                break
+
+            chunk_text = (
+                f"\n[Document {i}]\n"
+                f"Citation: {chunk.get_citation()}\n"
+                f"Content: {chunk.text}\n"
+            )
 
             # Check if adding this chunk would exceed limit
             if total_length + len(chunk_text) > self.max_context_length:
@@ -131,7 +158,13 @@ Follow these rules:
         context_str = self._build_context_section(context_chunks)
 
         # Build schema description
-        schema_desc = self._format_schema(extraction_schema)
+        schema_key = json.dumps(extraction_schema, sort_keys=True)
+        schema_desc = self._schema_cache.get(schema_key)
+        if schema_desc is None:
+            schema_desc = self._format_schema(extraction_schema)
+            if len(self._schema_cache) >= self.SCHEMA_CACHE_SIZE:
+                self._schema_cache.pop(next(iter(self._schema_cache)))
+            self._schema_cache[schema_key] = schema_desc
 
         prompt_parts = [
             "System:",
@@ -214,8 +247,6 @@ Follow these rules:
 
     def _format_examples(self, examples: List[Dict[str, Any]]) -> str:
         """Format few-shot examples."""
-        import json
-
         parts = []
         for i, ex in enumerate(examples, 1):
             parts.append(f"\nExample {i}:")
@@ -5,6 +5,7 @@ from typing import List, Optional
 from dataclasses import dataclass
 
 import httpx
+import orjson
 from qdrant_client import QdrantClient
 from qdrant_client.http.models import (
     Filter,
@@ -153,7 +154,7 @@ class QdrantStore:
 
         # Build request body for Qdrant v1.9.1 REST API
         body = {
-            "vector": vector if isinstance(vector, list) else vector.tolist(),
+            "vector": vector,
             "limit": limit,
             "with_payload": True,
         }
@@ -172,10 +173,13 @@ class QdrantStore:
 
         # Make direct HTTP request to Qdrant REST API
         url = f"{settings.qdrant_url}/collections/{settings.qdrant_collection}/points/search"
+        # orjson writes ndarray vectors straight to JSON without a list copy
+        content = orjson.dumps(body, option=orjson.OPT_SERIALIZE_NUMPY)
+        headers = {"Content-Type": "application/json"}
 
         try:
             start_search = time.perf_counter()
-            response = httpx.post(url, json=body, timeout=60)
+            response = httpx.post(url, content=content, headers=headers, timeout=60)
             response.raise_for_status()
             search_time = (time.perf_counter() - start_search) * 1000
             print(f"📡 Qdrant search request took {search_time:.2f}ms")
@@ -197,7 +201,7 @@ class QdrantStore:
                 client = self._get_client()
                 self._ensure_collection_exists(client)
                 # Retry
-                response = httpx.post(url, json=body, timeout=60)
+                response = httpx.post(url, content=content, headers=headers, timeout=60)
                 response.raise_for_status()
                 data = response.json()
                 results = []
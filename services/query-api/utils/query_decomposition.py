@@ -10,11 +10,14 @@ Benefits:
 - Enables parallel search execution
 """
 
-import hashlib
-import json
+import asyncio
+import heapq
 import re
 import httpx
-from typing import List, Dict, Tuple
+import orjson
+from collections import OrderedDict
+from operator import itemgetter
+from typing import List, Dict, Set, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
@@ -58,10 +61,13 @@ class QueryDecomposer:
         self,
         llm_gateway_url: str = None,
         max_subqueries: int = None,
+        max_cache_size: int = 10_000,
     ):
         self.llm_gateway_url = llm_gateway_url or settings.llm_gateway_url
         self.max_subqueries = max_subqueries or settings.decomposition_max_subqueries
-        self._decomposition_cache: Dict[str, DecomposedQuery] = {}
+        self.max_cache_size = max_cache_size
+        # LRU-ordered; bounded so query diversity cannot grow it without limit
+        self._decomposition_cache: OrderedDict[str, DecomposedQuery] = OrderedDict()
 
     def _generate_decomposition_prompt(self, query: str) -> str:
         """Generate the prompt for decomposing a query."""
@@ -101,9 +107,11 @@ JSON Response:"""
         Returns:
             DecomposedQuery with sub-queries
         """
-        cache_key = hashlib.md5(query.encode()).hexdigest()
+        # dicts hash str keys natively; no separate digest needed
+        cache_key = query.strip().lower()
 
         if use_cache and cache_key in self._decomposition_cache:
+            self._decomposition_cache.move_to_end(cache_key)
             return self._decomposition_cache[cache_key]
 
         sub_queries = []
@@ -126,7 +134,7 @@ JSON Response:"""
 
                 json_match = re.search(r"\{[\s\S]*\}", text)
                 if json_match:
-                    parsed = json.loads(json_match.group())
+                    parsed = orjson.loads(json_match.group())
                     parsed_queries = parsed.get("sub_queries", [])
 
                     for i, sq in enumerate(parsed_queries):
@@ -173,6 +181,9 @@ JSON Response:"""
         )
 
         self._decomposition_cache[cache_key] = result
+        self._decomposition_cache.move_to_end(cache_key)
+        while len(self._decomposition_cache) > self.max_cache_size:
+            self._decomposition_cache.popitem(last=False)
         return result
 
     def decompose_simple(self, query: str) -> DecomposedQuery:
@@ -289,19 +300,37 @@ class MultiQuerySearchEngine:
         if tenant_id:
             filters["tenant_id"] = tenant_id
 
-        all_results = []
-
+        # LLM sub-queries often repeat; search each distinct one only once
+        groups: Dict[str, List[SubQuery]] = {}
         for sub_query in decomposed.sub_queries:
-            results = await self._search_subquery(
-                sub_query.query,
-                filters,
-                top_k,
+            groups.setdefault(" ".join(sub_query.query.lower().split()), []).append(
+                sub_query
+            )
+        unique_queries = [members[0].query for members in groups.values()]
+
+        if decomposed.strategy == DecompositionStrategy.PARALLEL:
+            # Sub-queries are independent, so their searches can overlap
+            results_per_query = await asyncio.gather(
+                *(self._search_subquery(q, filters, top_k) for q in unique_queries)
             )
-            for r in results:
-                r["_sub_query_id"] = sub_query.id
-                r["_sub_query_intent"] = sub_query.intent
-                r["_is_primary"] = sub_query.is_primary
-            all_results.extend(results)
+        else:
+            results_per_query = [
+                await self._search_subquery(q, filters, top_k) for q in unique_queries
+            ]
+
+        all_results = []
+
+        for members, results in zip(groups.values(), results_per_query):
+            for sub_query in members:
+                all_results.extend(
+                    {
+                        **r,
+                        "_sub_query_id": sub_query.id,
+                        "_sub_query_intent": sub_query.intent,
+                        "_is_primary": sub_query.is_primary,
+                    }
+                    for r in results
+                )
 
         merged = self._merge_subquery_results(all_results, top_k, decomposed)
 
@@ -317,7 +346,9 @@ class MultiQuerySearchEngine:
         if self.search_engine is None:
             return []
 
-        results = self.search_engine.search(
+        # The backend search is blocking; run it off the event loop
+        results = await asyncio.to_thread(
+            self.search_engine.search,
             query=sub_query,
             filters=filters,
             top_k=top_k,
@@ -331,9 +362,10 @@ class MultiQuerySearchEngine:
         decomposed: DecomposedQuery,
     ) -> List[dict]:
         """Merge results from multiple sub-queries."""
-        from fusion import rrf_fusion
-
-        score_map: Dict[str, Tuple[float, List[int]]] = {}
+        # Single pass: best score, matching sub-queries and primary flag per doc
+        best_scores: Dict[str, float] = {}
+        sub_query_matches: Dict[str, Set[int]] = {}
+        primary_docs: Set[str] = set()
 
         for result in all_results:
             doc_id = result.get("id", "")
@@ -342,42 +374,31 @@ class MultiQuerySearchEngine:
                 "_sub_query_ids", [result.get("_sub_query_id", 0)]
             )
 
-            if doc_id not in score_map:
-                score_map[doc_id] = (score, sub_query_ids)
+            if doc_id not in best_scores:
+                best_scores[doc_id] = score
+                sub_query_matches[doc_id] = set(sub_query_ids)
             else:
-                current_score, current_ids = score_map[doc_id]
-                score_map[doc_id] = (
-                    max(current_score, score),
-                    list(set(current_ids + sub_query_ids)),
-                )
+                best_scores[doc_id] = max(best_scores[doc_id], score)
+                sub_query_matches[doc_id].update(sub_query_ids)
 
-        final_scores: Dict[str, float] = {}
-        for doc_id, (base_score, sub_query_ids) in score_map.items():
-            if len(sub_query_ids) > 1:
-                bonus = 0.1 * len(sub_query_ids)
-            else:
-                bonus = 0.0
+            if result.get("_is_primary"):
+                primary_docs.add(doc_id)
 
-            if any(r["_is_primary"] for r in all_results if r.get("id") == doc_id):
+        merged = []
+        for doc_id, base_score in best_scores.items():
+            matched_ids = sub_query_matches[doc_id]
+            bonus = 0.1 * len(matched_ids) if len(matched_ids) > 1 else 0.0
+            if doc_id in primary_docs:
                 bonus += 0.05
+            merged.append(
+                {
+                    "id": doc_id,
+                    "score": base_score + bonus,
+                    "sub_query_matches": sorted(matched_ids),
+                }
+            )
 
-            final_scores[doc_id] = base_score + bonus
-
-        ranked = sorted(final_scores.items(), key=lambda x: x[1], reverse=True)
-        return [
-            {
-                "id": doc_id,
-                "score": score,
-                "sub_query_matches": list(
-                    set(
-                        r.get("_sub_query_ids", [])
-                        for r in all_results
-                        if r.get("id") == doc_id
-                    )
-                ),
-            }
-            for doc_id, score in ranked[:top_k]
-        ]
+        return heapq.nlargest(top_k, merged, key=itemgetter("score"))
 
     def clear_caches(self):
         """Clear all internal caches."""
@@ -3,6 +3,8 @@ from dataclasses import dataclass
 from typing import Dict, List, Optional, Tuple, Any
 import logging
 
+import orjson
+
 logger = logging.getLogger("resolver")
 
 
@@ -24,6 +26,10 @@ def detect_conflicts(chunks) -> List[ConflictInfo]:
     - Multiple chunks have the same source_id (same document from different sources)
     - They have different versions or different content
     """
+    # Most retrievals have no shared source_id; skip grouping entirely
+    if len({c.source_id for c in chunks}) == len(chunks):
+        return []
+
     grouped = defaultdict(list)
     for c in chunks:
         grouped[c.source_id].append(c)
@@ -32,7 +38,7 @@ def detect_conflicts(chunks) -> List[ConflictInfo]:
     for source_id, items in grouped.items():
         if len(items) > 1:
             # Check if they're actually different
-            versions = set(c.version for c in items)
+            versions = {c.version for c in items}
             if len(versions) > 1:
                 conflicts.append(
                     ConflictInfo(
@@ -43,7 +49,7 @@ def detect_conflicts(chunks) -> List[ConflictInfo]:
                 )
             else:
                 # Same version but different sources - potential authority conflict
-                sources = set(c.source for c in items)
+                sources = {c.source for c in items}
                 if len(sources) > 1:
                     conflicts.append(
                         ConflictInfo(
@@ -72,6 +78,10 @@ def resolve_conflicts(
     Returns:
         Tuple of (resolved_chunks, conflict_info)
     """
+    # Conflict-free input (the common case) passes through unchanged
+    if len({(c.source_id, c.chunk_index) for c in chunks}) == len(chunks):
+        return list(chunks), []
+
     # Detect conflicts grouping by (source_id, chunk_index)
     grouped = defaultdict(list)
     for c in chunks:
@@ -83,6 +93,11 @@ def resolve_conflicts(
     conflicts = []
 
     for key, items in grouped.items():
+        if len(items) == 1:
+            # Most groups hold a single chunk; nothing to rank
+            resolved.append(items[0])
+            continue
+
         source_id, chunk_index = key
         # Sort by:
         # 1. Source priority (descending - higher authority first)
@@ -98,18 +113,17 @@ def resolve_conflicts(
         winner = items[0]
         resolved.append(winner)
 
-        if len(items) > 1:
-            # Check resolution type
-            versions = set(c.version for c in items)
-            res = "version_conflict" if len(versions) > 1 else "authority_conflict"
-            conflicts.append(
-                ConflictInfo(
-                    source_id=f"{source_id}:{chunk_index}",
-                    conflicting_chunks=items,
-                    resolution=res,
-                    winner_id=f"{winner.doc_id}:{winner.chunk_index}",
-                )
+        # Check resolution type
+        versions = {c.version for c in items}
+        res = "version_conflict" if len(versions) > 1 else "authority_conflict"
+        conflicts.append(
+            ConflictInfo(
+                source_id=f"{source_id}:{chunk_index}",
+                conflicting_chunks=items,
+                resolution=res,
+                winner_id=f"{winner.doc_id}:{winner.chunk_index}",
             )
+        )
 
     # Log conflicts if requested
     if log_conflicts and conflicts:
@@ -149,3 +163,16 @@ def get_citation(chunk, include_heading: bool = True) -> Dict[str, Any]:
         citation["heading_path"] = chunk.heading_path
 
     return citation
+
+
+def get_citation_bytes(chunk, include_heading: bool = True) -> bytes:
+    """
+    Generate citation information for a chunk, serialized as JSON bytes.
+
+    Same fields as get_citation, encoded with orjson so callers writing
+    straight to a response body skip the intermediate str.
+    """
+    return orjson.dumps(
+        get_citation(chunk, include_heading=include_heading),
+        option=orjson.OPT_NON_STR_KEYS,
+    )
@@ -23,13 +23,14 @@ Usage:
         return perform_rag(query, tenant_id)
 """
 
-import json
+import orjson
 import pickle
 import hashlib
 import zlib
-from typing import Any, Optional, Callable, Dict, List
+from typing import Any, Optional, Callable, Dict, List, Tuple
 from functools import wraps
 from datetime import datetime, timedelta
+import numpy as np
 import redis
 from dataclasses import dataclass, asdict
 import time
@@ -37,15 +38,38 @@ import threading
 from collections import OrderedDict
 import os
 
+try:
+    import xxhash
+except ImportError:  # xxhash is optional; blake2b is the stdlib fallback
+    xxhash = None
+
+
 # Configuration
 REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+REDIS_POOL_SIZE = int(os.getenv("REDIS_POOL_SIZE", "64"))
 CACHE_ENABLED = os.getenv("CACHE_ENABLED", "true").lower() == "true"
 CACHE_COMPRESSION = os.getenv("CACHE_COMPRESSION", "true").lower() == "true"
 CACHE_COMPRESSION_THRESHOLD = int(
     os.getenv("CACHE_COMPRESSION_THRESHOLD", "1024")
 )  # bytes
+# zlib level 1 is ~2x faster than the default 6 for ~2% larger payloads
+CACHE_COMPRESSION_LEVEL = int(os.getenv("CACHE_COMPRESSION_LEVEL", "1"))
+# Embeddings are cached at reduced precision; empty keeps them as given
+VECTOR_CACHE_DTYPE = os.getenv("VECTOR_CACHE_DTYPE", "float16")
+# Redis values start with a format version byte followed by a codec byte
+FORMAT_VERSION = b"\x01"
+FORMAT_PICKLE = FORMAT_VERSION + b"\x00"
+FORMAT_PICKLE_ZLIB = FORMAT_VERSION + b"\x01"
 L1_CACHE_SIZE = int(os.getenv("L1_CACHE_SIZE", "1000"))  # max items
 L1_CACHE_TTL = int(os.getenv("L1_CACHE_TTL", "60"))  # seconds
+L1_MAX_BYTES = int(os.getenv("L1_MAX_BYTES", "16384"))  # larger values skip L1
+
+
+def _hash_key(data: bytes) -> str:
+    """Fast non-cryptographic digest for cache keys."""
+    if xxhash is not None:
+        return xxhash.xxh3_128_hexdigest(data)
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
 
 
 @dataclass
@@ -62,61 +86,85 @@ class CacheEntry:
 
 
 class LRUCache:
-    """Thread-safe in-memory LRU cache (L1)."""
+    """Thread-safe in-memory LRU cache (L1).
+
+    Keys are spread over independently locked shards so concurrent lookups
+    of different keys rarely wait on each other. Each shard evicts its own
+    least recently used entry, which approximates global LRU order.
+    """
+
+    SHARDS = 16
 
     def __init__(self, maxsize: int = L1_CACHE_SIZE):
         self.maxsize = maxsize
-        self.cache: OrderedDict[str, Any] = OrderedDict()
-        self.lock = threading.RLock()
-        self.hits = 0
-        self.misses = 0
+        self._shard_maxsize = max(1, -(-maxsize // self.SHARDS))
+        self._shards: List[OrderedDict] = [OrderedDict() for _ in range(self.SHARDS)]
+        self._locks = [threading.Lock() for _ in range(self.SHARDS)]
+        # Per-shard counters, updated under that shard's lock
+        self._hits = [0] * self.SHARDS
+        self._misses = [0] * self.SHARDS
+
+    def _shard(self, key: str) -> int:
+        return hash(key) & (self.SHARDS - 1)
+
+    @property
+    def hits(self) -> int:
+        return sum(self._hits)
+
+    @property
+    def misses(self) -> int:
+        return sum(self._misses)
 
     def get(self, key: str) -> Optional[Any]:
         """Get item from cache."""
-        with self.lock:
-            if key in self.cache:
+        s = self._shard(key)
+        shard = self._shards[s]
+        with self._locks[s]:
+            if key in shard:
                 # Move to end (most recently used)
-                value = self.cache.pop(key)
-                self.cache[key] = value
-                self.hits += 1
-                return value
-            self.misses += 1
+                shard.move_to_end(key)
+                self._hits[s] += 1
+                return shard[key]
+            self._misses[s] += 1
             return None
 
     def set(self, key: str, value: Any):
         """Set item in cache."""
-        with self.lock:
-            if key in self.cache:
-                self.cache.pop(key)
-            elif len(self.cache) >= self.maxsize:
+        s = self._shard(key)
+        shard = self._shards[s]
+        with self._locks[s]:
+            if key in shard:
+                shard.move_to_end(key)
+            elif len(shard) >= self._shard_maxsize:
                 # Remove least recently used
-                self.cache.popitem(last=False)
+                shard.popitem(last=False)
 
-            self.cache[key] = value
+            shard[key] = value
 
     def delete(self, key: str):
         """Delete item from cache."""
-        with self.lock:
-            if key in self.cache:
-                del self.cache[key]
+        s = self._shard(key)
+        with self._locks[s]:
+            self._shards[s].pop(key, None)
 
     def clear(self):
         """Clear all items."""
-        with self.lock:
-            self.cache.clear()
+        for lock, shard in zip(self._locks, self._shards):
+            with lock:
+                shard.clear()
 
     def get_stats(self) -> Dict[str, int]:
         """Get cache statistics."""
-        with self.lock:
-            total = self.hits + self.misses
-            hit_rate = self.hits / total if total > 0 else 0
-            return {
-                "size": len(self.cache),
-                "maxsize": self.maxsize,
-                "hits": self.hits,
-                "misses": self.misses,
-                "hit_rate": round(hit_rate, 4),
-            }
+        hits, misses = self.hits, self.misses
+        total = hits + misses
+        hit_rate = hits / total if total > 0 else 0
+        return {
+            "size": sum(len(shard) for shard in self._shards),
+            "maxsize": self.maxsize,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hit_rate, 4),
+        }
 
 
 class RedisCache:
@@ -130,33 +178,40 @@ class RedisCache:
     def _connect(self):
         """Connect to Redis."""
         try:
-            self.redis_client = redis.from_url(
+            # Bounded pool shared across threads; redis-py uses hiredis if installed
+            pool = redis.BlockingConnectionPool.from_url(
                 self.redis_url,
+                max_connections=REDIS_POOL_SIZE,
                 decode_responses=False,  # We handle encoding ourselves
                 socket_connect_timeout=5,
                 socket_timeout=5,
                 health_check_interval=30,
             )
+            self.redis_client = redis.Redis(connection_pool=pool)
             self.redis_client.ping()
             print(f"✓ Connected to Redis: {self.redis_url}")
         except Exception as e:
             print(f"⚠ Redis connection failed: {e}")
             self.redis_client = None
 
-    def _compress(self, data: bytes) -> bytes:
-        """Compress data if enabled."""
+    def _encode(self, value: Any) -> bytes:
+        """Serialize a value behind a format header, compressing it if large."""
+        data = pickle.dumps(value)
         if CACHE_COMPRESSION and len(data) > CACHE_COMPRESSION_THRESHOLD:
-            return zlib.compress(data)
-        return data
-
-    def _decompress(self, data: bytes, compressed: bool = False) -> bytes:
-        """Decompress data."""
-        if compressed or (CACHE_COMPRESSION and data.startswith(b"x\\x9c")):
-            try:
-                return zlib.decompress(data)
-            except:
-                pass
-        return data
+            return FORMAT_PICKLE_ZLIB + zlib.compress(data, CACHE_COMPRESSION_LEVEL)
+        return FORMAT_PICKLE + data
+
+    def _decode(self, data: bytes) -> Any:
+        """Reverse _encode, dispatching on the format header."""
+        header = data[:2]
+        if header == FORMAT_PICKLE:
+            return pickle.loads(data[2:])
+        if header == FORMAT_PICKLE_ZLIB:
+            return pickle.loads(zlib.decompress(data[2:]))
+        # Entries written before the format header was introduced
+        if data.startswith(b"CMP:"):
+            return pickle.loads(zlib.decompress(data[4:]))
+        return pickle.loads(data)
 
     def get(self, key: str) -> Optional[Any]:
         """Get item from Redis."""
@@ -166,45 +221,65 @@ class RedisCache:
         try:
             data = self.redis_client.get(key)
             if data:
-                # Check if compressed
-                compressed = data.startswith(b"CMP:")
-                if compressed:
-                    data = data[4:]  # Remove prefix
-                    data = zlib.decompress(data)
-
-                return pickle.loads(data)
+                return self._decode(data)
         except Exception as e:
             print(f"Redis get error: {e}")
 
         return None
 
+    def mget(self, keys: List[str]) -> List[Optional[Any]]:
+        """Get several items from Redis in one round trip."""
+        if not self.redis_client or not keys:
+            return [None] * len(keys)
+
+        try:
+            return [
+                self._decode(data) if data else None
+                for data in self.redis_client.mget(keys)
+            ]
+        except Exception as e:
+            print(f"Redis mget error: {e}")
+            return [None] * len(keys)
+
     def set(self, key: str, value: Any, ttl: int = 300, tags: List[str] = None):
         """Set item in Redis."""
         if not self.redis_client:
             return False
 
         try:
-            # Serialize
-            data = pickle.dumps(value)
-
-            # Compress if large
-            compressed = False
-            if CACHE_COMPRESSION and len(data) > CACHE_COMPRESSION_THRESHOLD:
-                data = b"CMP:" + zlib.compress(data)
-                compressed = True
+            # Value and tag index go out in a single round trip
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.setex(key, ttl, self._encode(value))
+            if tags:
+                for tag in tags:
+                    pipe.sadd(f"tag:{tag}", key)
+                    pipe.expire(f"tag:{tag}", ttl)
+            pipe.execute()
+            return True
+        except Exception as e:
+            print(f"Redis set error: {e}")
+            return False
 
-            # Store
-            self.redis_client.setex(key, ttl, data)
+    def set_many(
+        self, items: List[Tuple[str, Any]], ttl: int = 300, tags: List[str] = None
+    ):
+        """Set several items in Redis in one pipelined round trip."""
+        if not self.redis_client or not items:
+            return False
 
-            # Add to tag index
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for key, value in items:
+                pipe.setex(key, ttl, self._encode(value))
             if tags:
+                keys = [key for key, _ in items]
                 for tag in tags:
-                    self.redis_client.sadd(f"tag:{tag}", key)
-                    self.redis_client.expire(f"tag:{tag}", ttl)
-
+                    pipe.sadd(f"tag:{tag}", *keys)
+                    pipe.expire(f"tag:{tag}", ttl)
+            pipe.execute()
             return True
         except Exception as e:
-            print(f"Redis set error: {e}")
+            print(f"Redis set_many error: {e}")
             return False
 
     def delete(self, key: str):
@@ -262,8 +337,20 @@ class CacheManager:
     def _generate_key(self, prefix: str, *args, **kwargs) -> str:
         """Generate cache key from arguments."""
         key_data = {"prefix": prefix, "args": args, "kwargs": kwargs}
-        key_str = json.dumps(key_data, sort_keys=True)
-        return f"{prefix}:{hashlib.md5(key_str.encode()).hexdigest()}"
+        key_bytes = orjson.dumps(
+            key_data, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+        )
+        return f"{prefix}:{_hash_key(key_bytes)}"
+
+    def _l1_set(self, key: str, value: Any):
+        """Store a value in L1 as pickled bytes, skipping oversized ones.
+
+        Bytes are far more compact than live object graphs (a list of floats
+        costs ~32 bytes per element), and callers can't mutate cached state.
+        """
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(blob) <= L1_MAX_BYTES:
+            self.l1_cache.set(key, blob)
 
     def get(self, key: str, use_l1: bool = True, use_l2: bool = True) -> Optional[Any]:
         """Get from cache (L1 -> L2)."""
@@ -272,9 +359,9 @@ class CacheManager:
 
         # Try L1
         if use_l1:
-            value = self.l1_cache.get(key)
-            if value is not None:
-                return value
+            blob = self.l1_cache.get(key)
+            if blob is not None:
+                return pickle.loads(blob)
 
         # Try L2
         if use_l2:
@@ -282,7 +369,7 @@ class CacheManager:
             if value is not None:
                 # Promote to L1
                 if use_l1:
-                    self.l1_cache.set(key, value)
+                    self._l1_set(key, value)
                 return value
 
         return None
@@ -302,7 +389,7 @@ class CacheManager:
 
         # L1 cache (short TTL)
         if use_l1:
-            self.l1_cache.set(key, value)
+            self._l1_set(key, value)
 
         # L2 cache (Redis)
         if use_l2:
@@ -387,9 +474,9 @@ class CacheManager:
                     return func(query, schema, tenant_id, *args, **kwargs)
 
                 # Include schema hash in key
-                schema_hash = hashlib.md5(
-                    json.dumps(schema, sort_keys=True).encode()
-                ).hexdigest()[:8]
+                schema_hash = _hash_key(
+                    orjson.dumps(schema, option=orjson.OPT_SORT_KEYS)
+                )[:8]
                 cache_key = self._generate_key(
                     "extract", query, schema_hash, tenant_id, *args, **kwargs
                 )
@@ -418,40 +505,38 @@ class CacheManager:
                 if not self.enabled:
                     return func(texts, *args, **kwargs)
 
-                # Individual text embeddings
-                results = []
-                missing_texts = []
-                missing_indices = []
-
-                for i, text in enumerate(texts):
-                    cache_key = self._generate_key("vector", text, *args, **kwargs)
-                    cached = self.get(
-                        cache_key, use_l1=False
-                    )  # Vectors too large for L1
-
-                    if cached is not None:
-                        results.append((i, cached))
-                    else:
-                        missing_texts.append(text)
-                        missing_indices.append(i)
-
-                if missing_texts:
+                # Vectors are too large for L1; fetch them all from L2 at once
+                keys = [
+                    self._generate_key("vector", text, *args, **kwargs)
+                    for text in texts
+                ]
+                results = [
+                    (
+                        cached.astype(np.float32).tolist()
+                        if isinstance(cached, np.ndarray)
+                        else cached
+                    )
+                    for cached in self.l2_cache.mget(keys)
+                ]
+                missing_indices = [i for i, r in enumerate(results) if r is None]
+
+                if missing_indices:
                     # Batch embed missing texts
-                    embeddings = func(missing_texts, *args, **kwargs)
+                    embeddings = func(
+                        [texts[i] for i in missing_indices], *args, **kwargs
+                    )
 
                     # Cache and add to results
-                    for idx, text, embedding in zip(
-                        missing_indices, missing_texts, embeddings
-                    ):
-                        cache_key = self._generate_key("vector", text, *args, **kwargs)
-                        self.set(
-                            cache_key, embedding, ttl, tags=["vector"], use_l1=False
-                        )
-                        results.append((idx, embedding))
-
-                # Sort by original index
-                results.sort(key=lambda x: x[0])
-                return [r[1] for r in results]
+                    items = []
+                    for idx, embedding in zip(missing_indices, embeddings):
+                        results[idx] = embedding
+                        stored = embedding
+                        if VECTOR_CACHE_DTYPE:
+                            stored = np.asarray(embedding, dtype=VECTOR_CACHE_DTYPE)
+                        items.append((keys[idx], stored))
+                    self.l2_cache.set_many(items, ttl, tags=["vector"])
+
+                return results
 
             return wrapper
 